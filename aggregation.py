@@ -0,0 +1,150 @@
+"""Инкрементальная агрегация результатов тренировок."""
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from homework import InfoMessage
+
+DAY: int = 24 * 60 * 60
+WEEK: int = 7 * DAY
+FIELDS: Tuple[str, ...] = ('duration', 'distance', 'speed', 'calories')
+
+Key = Tuple[str, str, int]
+
+
+class WorkoutStats:
+    """Суммы, минимумы и максимумы показателей группы тренировок."""
+
+    __slots__ = ('count', 'total', 'minimum', 'maximum')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = [0.0] * len(FIELDS)
+        self.minimum = [math.inf] * len(FIELDS)
+        self.maximum = [-math.inf] * len(FIELDS)
+
+    def update(self, info: InfoMessage) -> None:
+        """Учесть одну тренировку."""
+        self.count += 1
+        for index, field in enumerate(FIELDS):
+            value = getattr(info, field)
+            self.total[index] += value
+            if value < self.minimum[index]:
+                self.minimum[index] = value
+            if value > self.maximum[index]:
+                self.maximum[index] = value
+
+    def merge(self, other: 'WorkoutStats') -> None:
+        """Добавить статистику другой группы."""
+        self.count += other.count
+        for index in range(len(FIELDS)):
+            self.total[index] += other.total[index]
+            self.minimum[index] = min(self.minimum[index],
+                                      other.minimum[index])
+            self.maximum[index] = max(self.maximum[index],
+                                      other.maximum[index])
+
+    def get(self, field: str) -> Dict[str, float]:
+        """Получить сумму, среднее, минимум и максимум показателя."""
+        index = FIELDS.index(field)
+        total = self.total[index]
+        return {
+            'total': total,
+            'mean': total / self.count if self.count else 0.0,
+            'min': self.minimum[index],
+            'max': self.maximum[index],
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Представить статистику в виде, пригодном для JSON."""
+        return {'count': self.count, 'total': self.total,
+                'minimum': self.minimum, 'maximum': self.maximum}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'WorkoutStats':
+        """Восстановить статистику из результата to_dict."""
+        stats = cls()
+        stats.count = data['count']
+        stats.total = list(data['total'])
+        stats.minimum = list(data['minimum'])
+        stats.maximum = list(data['maximum'])
+        return stats
+
+
+class WorkoutAggregator:
+    """Статистика по пользователям, типам тренировок и окнам времени.
+
+    Каждое обновление затрагивает одну группу
+    (пользователь, тип тренировки, начало окна) и выполняется за O(1).
+    """
+
+    def __init__(self, window: int = DAY) -> None:
+        self.window = window
+        self.groups: Dict[Key, WorkoutStats] = {}
+
+    def window_start(self, timestamp: float) -> int:
+        """Получить начало окна, в которое попадает timestamp."""
+        return int(timestamp // self.window * self.window)
+
+    def update(self, user: str, info: InfoMessage, timestamp: float) -> None:
+        """Учесть тренировку пользователя, завершённую в timestamp."""
+        key = (user, info.training_type, self.window_start(timestamp))
+        stats = self.groups.get(key)
+        if stats is None:
+            stats = self.groups[key] = WorkoutStats()
+        stats.update(info)
+
+    def stats(self,
+              user: Optional[str] = None,
+              training_type: Optional[str] = None,
+              since: Optional[float] = None,
+              until: Optional[float] = None,
+              ) -> WorkoutStats:
+        """Собрать статистику по группам, подходящим под фильтры.
+
+        Окно учитывается, если его начало лежит в [since, until).
+        """
+        result = WorkoutStats()
+        for (group_user, group_type, start), stats in self.groups.items():
+            if user is not None and group_user != user:
+                continue
+            if training_type is not None and group_type != training_type:
+                continue
+            if since is not None and start < since:
+                continue
+            if until is not None and start >= until:
+                continue
+            result.merge(stats)
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Сохранить состояние агрегатора в словарь."""
+        groups: List[Dict[str, Any]] = [
+            {'user': user, 'training_type': training_type, 'start': start,
+             **stats.to_dict()}
+            for (user, training_type, start), stats in self.groups.items()
+        ]
+        return {'window': self.window, 'groups': groups}
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> 'WorkoutAggregator':
+        """Восстановить агрегатор из результата snapshot."""
+        aggregator = cls(data['window'])
+        for group in data['groups']:
+            key = (group['user'], group['training_type'], group['start'])
+            aggregator.groups[key] = WorkoutStats.from_dict(group)
+        return aggregator
+
+    def save(self, path: str) -> None:
+        """Атомарно записать снимок состояния в файл JSON."""
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as stream:
+            json.dump(self.snapshot(), stream)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'WorkoutAggregator':
+        """Загрузить агрегатор из файла, созданного save."""
+        with open(path, encoding='utf-8') as stream:
+            return cls.restore(json.load(stream))
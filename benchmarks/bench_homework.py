@@ -0,0 +1,128 @@
+"""Бенчмарки основного конвейера обработки пакетов.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_homework --count 100000 --output run.json
+    python -m benchmarks.bench_homework --baseline run.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from statistics import median
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.workload import generate_packages
+from homework import (CODE_WORKOUT, InfoMessage, Training, read_package,
+                      render_many)
+from package_io import Package
+
+Result = Dict[str, float]
+
+
+def measure(func: Callable[[], None], count: int, repeat: int) -> Result:
+    """Замерить func, обрабатывающую count элементов, repeat раз."""
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'best_s': min(timings),
+        'median_s': median(timings),
+        'ns_per_op': min(timings) / count * 1e9,
+    }
+
+
+def run(count: int, repeat: int, seed: int) -> Dict[str, Result]:
+    """Выполнить все бенчмарки на count синтетических пакетах."""
+    packages: List[Package] = list(generate_packages(count, seed=seed))
+    trainings: List[Training] = [read_package(*package)
+                                 for package in packages]
+    messages: List[InfoMessage] = [training.show_training_info()
+                                   for training in trainings]
+    results: Dict[str, Result] = {}
+
+    results['read_package'] = measure(
+        lambda: [read_package(*package) for package in packages],
+        count, repeat)
+
+    # Объекты создаются вне замеряемых функций, чтобы этапы
+    # не пересекались: регрессия в конструкторе видна в construct[...],
+    # а в формулах - в get_spent_calories[...] и show_training_info.
+    for code, training_class in CODE_WORKOUT.items():
+        rows = [data for workout_type, data in packages
+                if workout_type == code]
+        if not rows:
+            continue
+        built = [training_class(*row) for row in rows]
+        results[f'construct[{code}]'] = measure(
+            lambda: [training_class(*row) for row in rows],
+            len(rows), repeat)
+        results[f'get_spent_calories[{code}]'] = measure(
+            lambda: [training.get_spent_calories() for training in built],
+            len(rows), repeat)
+
+    results['show_training_info'] = measure(
+        lambda: [training.show_training_info() for training in trainings],
+        count, repeat)
+    results['get_message'] = measure(
+        lambda: [message.get_message() for message in messages],
+        count, repeat)
+    results['render_many'] = measure(
+        lambda: render_many(messages), count, repeat)
+    return results
+
+
+def compare(results: Dict[str, Result],
+            baseline: Dict[str, Result],
+            threshold: float) -> List[str]:
+    """Вернуть описания замедлений относительно baseline."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['ns_per_op'] / baseline[name]['ns_per_op']
+        if ratio > threshold:
+            regressions.append(f'{name}: медленнее в {ratio:.2f} раза')
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Запустить бенчмарки и сохранить результат в JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='файл для сохранения результатов')
+    parser.add_argument('--baseline', help='результаты предыдущего запуска')
+    parser.add_argument('--threshold', type=float, default=1.1,
+                        help='допустимое замедление относительно baseline')
+    args = parser.parse_args(argv)
+
+    results = run(args.count, args.repeat, args.seed)
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'count': args.count,
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'results': results,
+    }
+    for name, result in results.items():
+        print(f'{name:30} {result["ns_per_op"]:10.1f} нс/операцию')
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as stream:
+            json.dump(report, stream, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as stream:
+            baseline = json.load(stream)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(regression, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
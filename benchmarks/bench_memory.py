@@ -0,0 +1,69 @@
+"""Сравнение расхода памяти разных представлений тренировок.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_memory [количество тренировок]
+"""
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+from homework import (InfoMessage, Running, SportsWalking, Swimming,
+                      TrainingBatch)
+
+
+@dataclass
+class DictInfoMessage:
+    """InfoMessage без __slots__ для сравнения."""
+
+    training_type: str
+    duration: float
+    distance: float
+    speed: float
+    calories: float
+
+
+ROWS = {
+    Running: [15000, 1, 75],
+    SportsWalking: [9000, 1, 75, 180],
+    Swimming: [720, 1, 80, 25, 40],
+}
+
+
+def measure(build: Callable[[], object]) -> int:
+    """Вернуть объём памяти в байтах, занятый результатом build()."""
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def run(count: int) -> Dict[str, int]:
+    """Замерить память для count тренировок каждого вида."""
+    results: Dict[str, int] = {}
+    for training_class, row in ROWS.items():
+        name = training_class.__name__
+        results[f'{name}: objects'] = measure(
+            lambda: [training_class(*row) for _ in range(count)]
+        )
+        results[f'{name}: TrainingBatch'] = measure(
+            lambda: TrainingBatch(training_class, [row] * count)
+        )
+    info = ('Running', 1.0, 9.75, 9.75, 699.75)
+    results['InfoMessage: dict'] = measure(
+        lambda: [DictInfoMessage(*info) for _ in range(count)]
+    )
+    results['InfoMessage: slots'] = measure(
+        lambda: [InfoMessage(*info) for _ in range(count)]
+    )
+    return results
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for name, size in run(count).items():
+        print(f'{name:30} {size / count:8.1f} байт/тренировку')
@@ -0,0 +1,84 @@
+"""Время запуска: импорт homework и получение первого InfoMessage.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_startup --budget-ms 15 --output startup.json
+
+Замеры выполняются с кэшированным байткодом, как при запусках из cron:
+PYTHONDONTWRITEBYTECODE для дочерних интерпретаторов сбрасывается.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+FIRST_MESSAGE = ('import homework; '
+                 "homework.read_package('RUN', [15000, 1, 75])"
+                 '.show_training_info().get_message()')
+
+
+def run_python(code: str, *options: str) -> subprocess.CompletedProcess:
+    """Запустить отдельный интерпретатор с кодом code."""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return subprocess.run([sys.executable, *options, '-c', code],
+                          capture_output=True, text=True, check=True,
+                          env=env)
+
+
+def import_time_us(module: str) -> int:
+    """Суммарное время импорта module по `python -X importtime`, мкс."""
+    result = run_python(f'import {module}', '-X', 'importtime')
+    for line in reversed(result.stderr.splitlines()):
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f'в выводе importtime нет модуля {module}')
+
+
+def wall_time_ms(code: str) -> float:
+    """Время работы отдельного интерпретатора с кодом code, мс."""
+    start = time.perf_counter()
+    run_python(code)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(repeat: int) -> Dict[str, float]:
+    """Замерить показатели запуска, взяв лучший из repeat замеров."""
+    run_python(FIRST_MESSAGE)
+    return {
+        'import_homework_ms': min(import_time_us('homework')
+                                  for _ in range(repeat)) / 1000,
+        'interpreter_ms': min(wall_time_ms('pass') for _ in range(repeat)),
+        'first_message_ms': min(wall_time_ms(FIRST_MESSAGE)
+                                for _ in range(repeat)),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Выполнить замеры и сравнить время импорта с бюджетом."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=15.0,
+                        help='допустимое время импорта homework')
+    parser.add_argument('--output', help='файл для сохранения результатов')
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    for name, value in results.items():
+        print(f'{name:20} {value:8.2f}')
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as stream:
+            json.dump({'python': sys.version, 'budget_ms': args.budget_ms,
+                       'results': results}, stream, indent=2)
+    if results['import_homework_ms'] > args.budget_ms:
+        print(f'Импорт homework дольше бюджета {args.budget_ms} мс',
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
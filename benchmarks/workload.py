@@ -0,0 +1,51 @@
+"""Генераторы синтетической нагрузки для бенчмарков."""
+import random
+from typing import Callable, Dict, Iterator, List, Optional
+
+from package_io import Package
+
+DEFAULT_MIX: Dict[str, float] = {'RUN': 0.5, 'WLK': 0.3, 'SWM': 0.2}
+
+
+def running_data(rng: random.Random) -> List[float]:
+    """Данные пробежки: шаги, часы, вес."""
+    return [rng.randint(1000, 30000),
+            round(rng.uniform(0.25, 3), 2),
+            rng.randint(45, 120)]
+
+
+def walking_data(rng: random.Random) -> List[float]:
+    """Данные прогулки: шаги, часы, вес, рост."""
+    return [rng.randint(1000, 20000),
+            round(rng.uniform(0.25, 3), 2),
+            rng.randint(45, 120),
+            rng.randint(150, 200)]
+
+
+def swimming_data(rng: random.Random) -> List[float]:
+    """Данные заплыва: гребки, часы, вес, длина бассейна, число бассейнов."""
+    return [rng.randint(200, 3000),
+            round(rng.uniform(0.25, 2), 2),
+            rng.randint(45, 120),
+            rng.choice((25, 50)),
+            rng.randint(10, 80)]
+
+
+GENERATORS: Dict[str, Callable[[random.Random], List[float]]] = {
+    'RUN': running_data,
+    'WLK': walking_data,
+    'SWM': swimming_data,
+}
+
+
+def generate_packages(count: int,
+                      mix: Optional[Dict[str, float]] = None,
+                      seed: int = 0) -> Iterator[Package]:
+    """Лениво сгенерировать count пакетов с заданной долей типов."""
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    codes = list(mix)
+    weights = list(mix.values())
+    for _ in range(count):
+        workout_type = rng.choices(codes, weights)[0]
+        yield workout_type, GENERATORS[workout_type](rng)
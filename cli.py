@@ -0,0 +1,214 @@
+"""Командная строка фитнес-трекера.
+
+    python -m homework                     # демонстрационные пакеты
+    python -m homework process data/*.csv --output-format jsonl
+    python -m homework process big.bin --workers 8 --batch
+
+Модули чтения, записи, многопроцессной обработки и двоичного формата
+загружаются только в тех режимах, где они нужны, а демонстрационный
+запуск без аргументов не загружает даже argparse.
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from homework import compute_messages, read_package
+from homework import main as print_training
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+    from typing import IO, Iterable, Iterator, List, Optional
+
+    from homework import InfoMessage
+    from package_io import ErrorHandler, Package
+
+DEMO_PACKAGES: List[Package] = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+EXTENSIONS = {
+    '.csv': 'csv',
+    '.json': 'jsonl',
+    '.jsonl': 'jsonl',
+    '.bin': 'binary',
+}
+
+
+class InputError(Exception):
+    """Входной файл не удалось прочитать."""
+
+
+def expand_inputs(patterns: Iterable[str]) -> Iterator[str]:
+    """Раскрыть шаблоны путей; `-` означает stdin."""
+    for pattern in patterns:
+        paths = []
+        if any(char in pattern for char in '*?['):
+            import glob
+
+            paths = sorted(glob.glob(pattern))
+        yield from paths or [pattern]
+
+
+def detect_format(path: str, default: str = 'csv') -> str:
+    """Определить формат входного файла по расширению."""
+    for extension, fmt in EXTENSIONS.items():
+        if path.endswith(extension):
+            return fmt
+    return default
+
+
+def read_inputs(patterns: Iterable[str],
+                fmt: Optional[str] = None,
+                on_error: Optional[ErrorHandler] = None
+                ) -> Iterator[Package]:
+    """Лениво прочитать пакеты из всех входных файлов.
+
+    Строки CSV и JSON Lines, которые не удалось разобрать,
+    передаются в on_error.
+    """
+    from package_io import iter_packages
+
+    for path in expand_inputs(patterns):
+        input_format = fmt or detect_format(path)
+        if input_format == 'binary':
+            import packed
+
+            try:
+                if path == '-':
+                    data = memoryview(sys.stdin.buffer.read())
+                    yield from packed.iter_packages(data)
+                else:
+                    with packed.map_file(path) as data:
+                        yield from packed.iter_packages(data)
+            except ValueError as error:
+                raise InputError(f'{path}: {error}') from error
+        else:
+            yield from iter_packages(path, input_format, on_error)
+
+
+def process(packages: Iterable[Package],
+            workers: int = 1,
+            chunk_size: int = 1000,
+            batch: bool = False) -> Iterator[InfoMessage]:
+    """Выбрать способ обработки пакетов по параметрам запуска."""
+    from package_io import chunked, process_packages
+
+    if workers > 1:
+        import parallel
+
+        return parallel.process_parallel(packages, workers, chunk_size,
+                                         batch=batch)
+    if batch:
+        return (message
+                for chunk in chunked(packages, chunk_size)
+                for message in compute_messages(chunk))
+    return process_packages(packages)
+
+
+def run_process(args: argparse.Namespace, out: IO[str]) -> int:
+    """Выполнить команду process."""
+    from package_io import WRITERS
+    from validation import DeadLetterSink, validate_packages
+
+    rejects = None
+    if args.rejects:
+        rejects = open(args.rejects, 'w', encoding='utf-8')
+    sink = DeadLetterSink(rejects)
+    start = time.perf_counter()
+    try:
+        packages = validate_packages(
+            read_inputs(args.inputs, args.format, sink.reject_line), sink
+        )
+        messages = process(packages, args.workers, args.chunk_size,
+                           args.batch)
+        if args.output_format == 'columnar':
+            import columnar
+
+            count = columnar.write_columns(messages, args.output)
+        elif args.output and args.output != '-':
+            with open(args.output, 'w', encoding='utf-8',
+                      newline='') as stream:
+                count = WRITERS[args.output_format](messages, stream)
+        else:
+            count = WRITERS[args.output_format](messages, out)
+    finally:
+        if rejects is not None:
+            rejects.close()
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        rate = count / elapsed if elapsed else 0.0
+        print(f'Обработано пакетов: {count}, отклонено: {len(sink)}, '
+              f'время: {elapsed:.3f} с, скорость: {rate:.0f} пакетов/с',
+              file=sys.stderr)
+        for reason, rejected in sorted(sink.counters.items()):
+            print(f'  {reason}: {rejected}', file=sys.stderr)
+    return 1 if len(sink) and args.strict else 0
+
+
+def run_demo() -> int:
+    """Обработать демонстрационные пакеты."""
+    for workout_type, data in DEMO_PACKAGES:
+        print_training(read_package(workout_type, data))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создать разборщик аргументов командной строки."""
+    import argparse
+
+    from package_io import READERS, WRITERS
+
+    parser = argparse.ArgumentParser(prog='python -m homework',
+                                     description='Модуль фитнес-трекера')
+    commands = parser.add_subparsers(dest='command')
+    command = commands.add_parser('process', help='обработать файлы пакетов')
+    command.add_argument('inputs', nargs='+',
+                         help='файлы или шаблоны путей, `-` для stdin')
+    command.add_argument('--format', choices=sorted(READERS) + ['binary'],
+                         help='формат входных данных '
+                              '(по умолчанию по расширению)')
+    command.add_argument('--output', '-o',
+                         help='файл результатов или каталог для columnar')
+    command.add_argument('--output-format',
+                         choices=sorted(WRITERS) + ['columnar'],
+                         default='text')
+    command.add_argument('--workers', type=int, default=1,
+                         help='число процессов-исполнителей')
+    command.add_argument('--chunk-size', type=int, default=1000)
+    command.add_argument('--batch', action='store_true',
+                         help='считать блоки через compute_batch')
+    command.add_argument('--rejects',
+                         help='файл JSON Lines для отклонённых пакетов')
+    command.add_argument('--strict', action='store_true',
+                         help='код возврата 1, если были отклонённые пакеты')
+    command.add_argument('--quiet', '-q', action='store_true',
+                         help='не выводить сводку')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        return run_demo()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if (args.command == 'process' and args.output_format == 'columnar'
+            and not args.output):
+        parser.error('для --output-format columnar нужен --output')
+    if args.command == 'process':
+        try:
+            return run_process(args, sys.stdout)
+        except InputError as error:
+            print(f'Ошибка: {error}', file=sys.stderr)
+            return 1
+    return run_demo()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
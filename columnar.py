@@ -0,0 +1,157 @@
+"""Поколоночное хранение полей InfoMessage.
+
+Набор данных - это каталог, в котором каждое поле лежит в отдельном
+файле: `training_type.u8` (номер типа в словаре из schema.json) и
+`<поле>.f64` (значения float64 в порядке байтов платформы). Файлы только
+дописываются и могут отображаться в память для чтения одной колонки.
+"""
+import json
+import mmap
+import os
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from homework import InfoMessage
+
+SCHEMA = 'schema.json'
+TYPE_COLUMN = 'training_type'
+FLOAT_COLUMNS = ('duration', 'distance', 'speed', 'calories')
+DEFAULT_BUFFER_ROWS: int = 64 * 1024
+
+
+def column_path(path: str, name: str) -> str:
+    """Получить путь к файлу колонки name."""
+    suffix = 'u8' if name == TYPE_COLUMN else 'f64'
+    return os.path.join(path, f'{name}.{suffix}')
+
+
+def load_types(path: str) -> List[str]:
+    """Прочитать словарь типов тренировок набора данных."""
+    schema_path = os.path.join(path, SCHEMA)
+    if not os.path.exists(schema_path):
+        return []
+    with open(schema_path, encoding='utf-8') as stream:
+        return json.load(stream)['training_types']
+
+
+class ColumnarWriter:
+    """Буферизованная дозапись сообщений в поколоночный набор данных."""
+
+    def __init__(self,
+                 path: str,
+                 buffer_rows: int = DEFAULT_BUFFER_ROWS) -> None:
+        self.path = path
+        self.buffer_rows = buffer_rows
+        os.makedirs(path, exist_ok=True)
+        self.types = load_types(path)
+        self.type_codes = {name: code for code, name in enumerate(self.types)}
+        self.columns: Dict[str, array] = {TYPE_COLUMN: array('B')}
+        self.columns.update((name, array('d')) for name in FLOAT_COLUMNS)
+        self.files = {name: open(column_path(path, name), 'ab')
+                      for name in self.columns}
+        self.written = 0
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def write(self, message: InfoMessage) -> None:
+        """Добавить одно сообщение."""
+        code = self.type_codes.get(message.training_type)
+        if code is None:
+            if len(self.types) > 255:
+                raise ValueError('слишком много типов тренировок')
+            code = self.type_codes[message.training_type] = len(self.types)
+            self.types.append(message.training_type)
+        columns = self.columns
+        columns[TYPE_COLUMN].append(code)
+        columns['duration'].append(message.duration)
+        columns['distance'].append(message.distance)
+        columns['speed'].append(message.speed)
+        columns['calories'].append(message.calories)
+        self.written += 1
+        if len(columns[TYPE_COLUMN]) >= self.buffer_rows:
+            self.flush()
+
+    def write_many(self, messages: Iterable[InfoMessage]) -> int:
+        """Добавить сообщения и вернуть их количество."""
+        written = self.written
+        for message in messages:
+            self.write(message)
+        return self.written - written
+
+    def flush(self) -> None:
+        """Записать накопленные строки и словарь типов на диск."""
+        for name, column in self.columns.items():
+            column.tofile(self.files[name])
+            self.files[name].flush()
+            del column[:]
+        tmp_path = os.path.join(self.path, SCHEMA + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as stream:
+            json.dump({'training_types': self.types,
+                       'columns': [TYPE_COLUMN, *FLOAT_COLUMNS]}, stream)
+        os.replace(tmp_path, os.path.join(self.path, SCHEMA))
+
+    def close(self) -> None:
+        """Записать остаток буфера и закрыть файлы."""
+        self.flush()
+        for stream in self.files.values():
+            stream.close()
+
+
+def write_columns(messages: Iterable[InfoMessage], path: str) -> int:
+    """Дописать сообщения в набор данных path."""
+    with ColumnarWriter(path) as writer:
+        return writer.write_many(messages)
+
+
+class ColumnarReader:
+    """Чтение колонок набора данных через отображение файлов в память."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.types = load_types(path)
+        self._maps: List[mmap.mmap] = []
+        self._views: List[memoryview] = []
+
+    def __enter__(self) -> 'ColumnarReader':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return os.path.getsize(column_path(self.path, TYPE_COLUMN))
+
+    def column(self, name: str) -> memoryview:
+        """Получить колонку name без копирования данных."""
+        typecode = 'B' if name == TYPE_COLUMN else 'd'
+        with open(column_path(self.path, name), 'rb') as stream:
+            if not os.fstat(stream.fileno()).st_size:
+                return memoryview(array(typecode))
+            data = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(data)
+        view = memoryview(data).cast(typecode)
+        self._views.append(view)
+        return view
+
+    def iter_messages(self,
+                      limit: Optional[int] = None) -> Iterator[InfoMessage]:
+        """Собрать сообщения обратно из колонок."""
+        codes = self.column(TYPE_COLUMN)
+        columns = [self.column(name) for name in FLOAT_COLUMNS]
+        count = len(codes) if limit is None else min(limit, len(codes))
+        for index in range(count):
+            yield InfoMessage(self.types[codes[index]],
+                              *[column[index] for column in columns])
+
+    def close(self) -> None:
+        """Освободить отображения файлов."""
+        for view in self._views:
+            view.release()
+        for data in self._maps:
+            data.close()
+        self._views.clear()
+        self._maps.clear()
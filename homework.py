@@ -1,25 +1,96 @@
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Type
+from __future__ import annotations
+
+from collections import namedtuple
+
+# typing и dataclasses не импортируются при запуске модуля:
+# короткие запуски тратили на них большую часть времени импорта.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import (IO, Any, Callable, Dict, Iterable, Iterator, List,
+                        Optional, Sequence, Tuple, Type)
+
+    BatchResult = Tuple[List[float], List[float], List[float]]
 
 
-@dataclass
 class InfoMessage:
     """Информационное сообщение о тренировке."""
 
-    training_type: str
-    duration: float
-    distance: float
-    speed: float
-    calories: float
+    __slots__ = ('training_type', 'duration', 'distance', 'speed', 'calories')
+
+    def __init__(self,
+                 training_type: str,
+                 duration: float,
+                 distance: float,
+                 speed: float,
+                 calories: float,
+                 ) -> None:
+        self.training_type = training_type
+        self.duration = duration
+        self.distance = distance
+        self.speed = speed
+        self.calories = calories
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}'
+                           for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name)
+                   for name in self.__slots__)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    MESSAGE = ('Тип тренировки: %s; '
+               'Длительность: %.3f ч.; '
+               'Дистанция: %.3f км; '
+               'Ср. скорость: %.3f км/ч; '
+               'Потрачено ккал: %.3f.')
 
     def get_message(self) -> str:
         """Создание сообщения о результатах тренировки."""
-        msg = f'Тип тренировки: {self.training_type}; '
-        msg += 'Длительность: {0:.3f} ч.; '.format(self.duration)
-        msg += 'Дистанция: {0:.3f} км; '.format(self.distance)
-        msg += 'Ср. скорость: {0:.3f} км/ч; '.format(self.speed)
-        msg += 'Потрачено ккал: {0:.3f}.'.format(self.calories)
-        return msg
+        return self.MESSAGE % (self.training_type,
+                               self.duration,
+                               self.distance,
+                               self.speed,
+                               self.calories)
+
+
+def render_many(messages: Iterable[InfoMessage],
+                out: Optional[IO[str]] = None) -> Optional[str]:
+    """Отрисовать сообщения по одному в строке.
+
+    Если передан поток out, текст записывается в него одним вызовом
+    write, иначе возвращается строкой.
+    """
+    template = InfoMessage.MESSAGE + '\n'
+    text = ''.join([template % (message.training_type,
+                                message.duration,
+                                message.distance,
+                                message.speed,
+                                message.calories)
+                    for message in messages])
+    if out is None:
+        return text
+    out.write(text)
+    return None
+
+
+class TrainingMetrics(
+        namedtuple('TrainingMetrics', ('distance', 'speed', 'calories'))):
+    """Рассчитанные показатели тренировки."""
+
+    __slots__ = ()
+
+
+def defining_class(cls: type, name: str) -> Optional[type]:
+    """Найти класс из MRO cls, в котором определён атрибут name."""
+    for owner in cls.__mro__:
+        if name in vars(owner):
+            return owner
+    return None
 
 
 class Training:
@@ -28,6 +99,30 @@ class Training:
     LEN_STEP: float = 0.65
     M_IN_KM: int = 1000
     MIN_IN_HOUR: int = 60
+    POSITIVE_FIELDS: Tuple[str, ...] = ('duration', 'weight')
+    # Допустимые диапазоны значений пакета: шаги или гребки,
+    # длительность в часах (не меньше секунды), вес в кг.
+    FIELD_LIMITS: Dict[str, Tuple[float, float]] = {
+        'action': (0, 1_000_000),
+        'duration': (1 / 3600, 48),
+        'weight': (0, 500),
+    }
+
+    # Можно ли считать скорость и калории через _mean_speed
+    # и _spent_calories или нужно вызывать переопределённые
+    # публичные методы. Вычисляется для каждого подкласса.
+    _SPEED_HELPER: bool = True
+    _CALORIES_HELPER: bool = True
+    # Определил ли класс собственные формулы для пачек. Иначе
+    # compute_batch считает каждую строку через скалярные методы.
+    _BATCH_FORMULAS: bool = False
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._SPEED_HELPER = defining_class(cls, 'get_mean_speed') is Training
+        cls._CALORIES_HELPER = (defining_class(cls, 'get_spent_calories')
+                                is defining_class(cls, '_spent_calories'))
+        cls._BATCH_FORMULAS = '_batch_spent_calories' in vars(cls)
 
     def __init__(self,
                  action: int,
@@ -45,7 +140,12 @@ class Training:
 
     def get_mean_speed(self) -> float:
         """Получить среднюю скорость движения."""
-        distance = self.get_distance()
+        return self._mean_speed(self.get_distance())
+
+    def _mean_speed(self, distance: float) -> float:
+        """Средняя скорость по уже рассчитанной дистанции."""
+        if not self.duration:
+            return 0.0
         mean_speed = distance / self.duration
         return mean_speed
 
@@ -56,16 +156,149 @@ class Training:
             ': не был переопределен метод get_spent_calories!'
         )
 
+    def _spent_calories(self, avg_speed: float) -> float:
+        """Калории по уже рассчитанной средней скорости.
+
+        Классы, переопределившие только get_spent_calories,
+        считают калории через него.
+        """
+        return self.get_spent_calories()
+
+    def _compute_metrics(self) -> Tuple[float, float, float]:
+        """Рассчитать дистанцию, скорость и калории за один проход.
+
+        Дистанция передаётся в расчёт скорости, а скорость - в расчёт
+        калорий, если подкласс не переопределил публичные методы.
+        """
+        distance = self.get_distance()
+        if self._SPEED_HELPER:
+            speed = self._mean_speed(distance)
+        else:
+            speed = self.get_mean_speed()
+        if self._CALORIES_HELPER:
+            calories = self._spent_calories(speed)
+        else:
+            calories = self.get_spent_calories()
+        return distance, speed, calories
+
+    @property
+    def metrics(self) -> TrainingMetrics:
+        """Дистанция, средняя скорость и калории тренировки.
+
+        Показатели не кэшируются и считаются при каждом обращении.
+        """
+        return TrainingMetrics(*self._compute_metrics())
+
     def show_training_info(self) -> InfoMessage:
         """Вернуть информационное сообщение о выполненной тренировке."""
         info = InfoMessage(type(self).__name__,
                            self.duration,
-                           self.get_distance(),
-                           self.get_mean_speed(),
-                           self.get_spent_calories())
+                           *self._compute_metrics())
         return info
 
+    @classmethod
+    def compute_batch(cls, rows: Iterable[Sequence[float]]) -> BatchResult:
+        """Рассчитать дистанцию, скорость и калории для пачки тренировок.
+
+        Каждая строка содержит те же значения, что и аргументы
+        конструктора класса. Формулы совпадают со скалярными методами.
+        Строка другой длины вызывает TypeError, как и конструктор.
+
+        Класс без собственного _batch_spent_calories (например,
+        добавленный через register_workout) считается построчно
+        через скалярные методы, а не формулами родителя.
+        """
+        rows = list(rows)
+        arity = len(constructor_fields(cls))
+        for row in rows:
+            if len(row) != arity:
+                raise TypeError(f'{cls.__name__} ожидает {arity} значений, '
+                                f'получено {len(row)}')
+        if not cls._BATCH_FORMULAS:
+            results = [cls(*row)._compute_metrics() for row in rows]
+            if not results:
+                return [], [], []
+            distances, speeds, calories = map(list, zip(*results))
+            return distances, speeds, calories
+        columns = list(zip(*rows))
+        if not columns:
+            return [], [], []
+        distances = [action * cls.LEN_STEP / cls.M_IN_KM
+                     for action in columns[0]]
+        speeds = cls._batch_mean_speed(columns, distances)
+        calories = cls._batch_spent_calories(columns, speeds)
+        return distances, speeds, calories
+
+    @classmethod
+    def _batch_mean_speed(cls,
+                          columns: List[Tuple[float, ...]],
+                          distances: List[float]
+                          ) -> List[float]:
+        """Получить средние скорости для пачки тренировок."""
+        return [distance / duration if duration else 0.0
+                for distance, duration in zip(distances, columns[1])]
+
+    @classmethod
+    def _batch_spent_calories(cls,
+                              columns: List[Tuple[float, ...]],
+                              speeds: List[float]
+                              ) -> List[float]:
+        """Получить затраченные калории для пачки тренировок."""
+        raise NotImplementedError(
+            cls.__name__,
+            ': не был переопределен метод _batch_spent_calories!'
+        )
+
+
+class WorkoutType(
+        namedtuple('WorkoutType',
+                   ('code', 'training_class', 'fields', 'positive',
+                    'limits'))):
+    """Запись реестра типов тренировок.
+
+    limits - диапазоны (минимум, максимум) значений полей; для полей
+    без записи в FIELD_LIMITS класса ограничен только знак.
+    """
+
+    __slots__ = ()
+
+    @property
+    def arity(self) -> int:
+        """Количество значений в пакете."""
+        return len(self.fields)
+
+
+WORKOUT_TYPES: Dict[str, WorkoutType] = {}
+CODE_WORKOUT: Dict[str, Type[Training]] = {}
+
+
+def constructor_fields(training_class: Type[Training]) -> Tuple[str, ...]:
+    """Получить имена аргументов конструктора класса тренировки."""
+    code = training_class.__init__.__code__
+    return code.co_varnames[1:code.co_argcount]
 
+
+def register_workout(code: str
+                     ) -> Callable[[Type[Training]], Type[Training]]:
+    """Зарегистрировать класс тренировки под кодом пакета."""
+    def decorator(training_class: Type[Training]) -> Type[Training]:
+        if code in WORKOUT_TYPES:
+            raise ValueError(f'Код тренировки {code} уже занят '
+                             f'классом {CODE_WORKOUT[code].__name__}')
+        fields = constructor_fields(training_class)
+        positive = tuple(field in training_class.POSITIVE_FIELDS
+                         for field in fields)
+        limits = tuple(training_class.FIELD_LIMITS.get(field,
+                                                       (0, float('inf')))
+                       for field in fields)
+        WORKOUT_TYPES[code] = WorkoutType(code, training_class,
+                                          fields, positive, limits)
+        CODE_WORKOUT[code] = training_class
+        return training_class
+    return decorator
+
+
+@register_workout('RUN')
 class Running(Training):
     """Тренировка: бег."""
 
@@ -75,18 +308,37 @@ class Running(Training):
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий
         после бега."""
-        avg_speed = self.get_mean_speed()
+        return self._spent_calories(self.get_mean_speed())
+
+    def _spent_calories(self, avg_speed: float) -> float:
         dur_in_min = self.duration * self.MIN_IN_HOUR
         var_1 = self.COEFF_CALORIE_1 * avg_speed - self.COEFF_CALORIE_2
         spent_calories = var_1 * self.weight / self.M_IN_KM * dur_in_min
         return spent_calories
 
+    @classmethod
+    def _batch_spent_calories(cls,
+                              columns: List[Tuple[float, ...]],
+                              speeds: List[float]
+                              ) -> List[float]:
+        """Получить затраченные калории для пачки пробежек."""
+        return [(cls.COEFF_CALORIE_1 * speed - cls.COEFF_CALORIE_2)
+                * weight / cls.M_IN_KM * (duration * cls.MIN_IN_HOUR)
+                for speed, duration, weight
+                in zip(speeds, columns[1], columns[2])]
+
 
+@register_workout('WLK')
 class SportsWalking(Training):
     """Тренировка: спортивная ходьба."""
 
     COEFF_CALORIE_1: float = 0.035
     COEFF_CALORIE_2: float = 0.029
+    POSITIVE_FIELDS: Tuple[str, ...] = ('duration', 'weight', 'height')
+    FIELD_LIMITS: Dict[str, Tuple[float, float]] = {
+        **Training.FIELD_LIMITS,
+        'height': (0, 300),
+    }
 
     def __init__(self,
                  action: int,
@@ -100,7 +352,9 @@ class SportsWalking(Training):
     def get_spent_calories(self) -> float:
         """Получить затраченное количество калорий
         после спортивной ходьбы."""
-        avg_speed = self.get_mean_speed()
+        return self._spent_calories(self.get_mean_speed())
+
+    def _spent_calories(self, avg_speed: float) -> float:
         dur_in_min = self.duration * self.MIN_IN_HOUR
         var_1 = (avg_speed**2 // self.height) * self.COEFF_CALORIE_2
         var_2 = var_1 * self.weight
@@ -108,13 +362,32 @@ class SportsWalking(Training):
         spent_calories = (var_2 + var_3) * dur_in_min
         return spent_calories
 
+    @classmethod
+    def _batch_spent_calories(cls,
+                              columns: List[Tuple[float, ...]],
+                              speeds: List[float]
+                              ) -> List[float]:
+        """Получить затраченные калории для пачки прогулок."""
+        return [((speed**2 // height) * cls.COEFF_CALORIE_2 * weight
+                 + cls.COEFF_CALORIE_1 * weight)
+                * (duration * cls.MIN_IN_HOUR)
+                for speed, duration, weight, height
+                in zip(speeds, columns[1], columns[2], columns[3])]
+
 
+@register_workout('SWM')
 class Swimming(Training):
     """Тренировка: плавание."""
 
     LEN_STEP: float = 1.38
     COEFF_CALORIE_1: float = 1.1
     COEFF_CALORIE_2: float = 2
+    POSITIVE_FIELDS: Tuple[str, ...] = ('duration', 'weight', 'length_pool')
+    FIELD_LIMITS: Dict[str, Tuple[float, float]] = {
+        **Training.FIELD_LIMITS,
+        'length_pool': (0, 100),
+        'count_pool': (0, 10_000),
+    }
 
     def __init__(self,
                  action: int,
@@ -127,8 +400,10 @@ class Swimming(Training):
         self.length_pool = length_pool
         self.count_pool = count_pool
 
-    def get_mean_speed(self) -> float:
+    def _mean_speed(self, distance: float) -> float:
         """Получить среднюю скорость во время плавания."""
+        if not self.duration:
+            return 0.0
         var_1 = self.length_pool * self.count_pool
         mean_speed = var_1 / self.M_IN_KM / self.duration
         return mean_speed
@@ -136,28 +411,226 @@ class Swimming(Training):
     def get_spent_calories(self) -> float:
         """Получить затраченное количество калорий
         после плавания."""
-        avg_speed = self.get_mean_speed()
+        return self._spent_calories(self.get_mean_speed())
+
+    def _spent_calories(self, avg_speed: float) -> float:
         var_1 = self.COEFF_CALORIE_2 * self.weight
         spent_calories = (avg_speed + self.COEFF_CALORIE_1) * var_1
         return spent_calories
 
+    @classmethod
+    def _batch_mean_speed(cls,
+                          columns: List[Tuple[float, ...]],
+                          distances: List[float]
+                          ) -> List[float]:
+        """Получить средние скорости для пачки заплывов."""
+        return [length_pool * count_pool / cls.M_IN_KM / duration
+                if duration else 0.0
+                for duration, length_pool, count_pool
+                in zip(columns[1], columns[3], columns[4])]
+
+    @classmethod
+    def _batch_spent_calories(cls,
+                              columns: List[Tuple[float, ...]],
+                              speeds: List[float]
+                              ) -> List[float]:
+        """Получить затраченные калории для пачки заплывов."""
+        return [(speed + cls.COEFF_CALORIE_1) * (cls.COEFF_CALORIE_2 * weight)
+                for speed, weight in zip(speeds, columns[2])]
+
+
+class TrainingView:
+    """Лёгкое представление одной тренировки из TrainingBatch.
+
+    Не используется напрямую: view_class строит для класса
+    тренировки подкласс обоих классов, в котором поля конструктора -
+    свойства, читающие столбцы пачки. Методы get_* находятся обычным
+    поиском по MRO, поэтому представление не медленнее объекта
+    тренировки и не хранит собственных данных.
+    """
+
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch: 'TrainingBatch', index: int) -> None:
+        self._batch = batch
+        self._index = index
+
+    def show_training_info(self) -> InfoMessage:
+        """Вернуть информационное сообщение о выполненной тренировке."""
+        info = super().show_training_info()  # type: ignore[misc]
+        info.training_type = self._batch.training_class.__name__
+        return info
+
+
+VIEW_CLASSES: Dict[Type[Training], type] = {}
+
+
+def column_property(field: str) -> property:
+    """Свойство, читающее значение поля из столбца пачки."""
+    def getter(view: TrainingView) -> float:
+        return view._batch.columns[field][view._index]
+    return property(getter)
+
+
+def view_class(training_class: Type[Training]) -> type:
+    """Получить класс представления для класса тренировки.
+
+    Класс строится один раз и хранится в VIEW_CLASSES.
+    """
+    view = VIEW_CLASSES.get(training_class)
+    if view is None:
+        namespace: Dict[str, Any] = {'__slots__': ()}
+        for field in constructor_fields(training_class):
+            namespace[field] = column_property(field)
+        view = VIEW_CLASSES[training_class] = type(
+            f'{training_class.__name__}View',
+            (TrainingView, training_class), namespace
+        )
+    return view
+
+
+class TrainingBatch:
+    """Тренировки одного типа, хранящиеся по столбцам.
+
+    Значения параметров лежат в массивах `array('d')`, по одному
+    на каждый аргумент конструктора класса тренировки.
+    """
+
+    def __init__(self,
+                 training_class: Type[Training],
+                 rows: Iterable[Sequence[float]] = ()
+                 ) -> None:
+        from array import array
+
+        self.training_class = training_class
+        self.fields = constructor_fields(training_class)
+        self.view = view_class(training_class)
+        self.columns: Dict[str, array] = {
+            field: array('d') for field in self.fields
+        }
+        self.extend(rows)
+
+    def __len__(self) -> int:
+        return len(self.columns[self.fields[0]])
+
+    def __getitem__(self, index: int) -> TrainingView:
+        if not -len(self) <= index < len(self):
+            raise IndexError('индекс тренировки вне диапазона')
+        return self.view(self, index % len(self))
+
+    def __iter__(self) -> Iterator[TrainingView]:
+        view = self.view
+        return (view(self, index) for index in range(len(self)))
+
+    def append(self, data: Sequence[float]) -> None:
+        """Добавить тренировку в пачку."""
+        if len(data) != len(self.fields):
+            raise TypeError(
+                f'{self.training_class.__name__} ожидает '
+                f'{len(self.fields)} значений, получено {len(data)}'
+            )
+        for column, value in zip(self.columns.values(), data):
+            column.append(value)
+
+    def extend(self, rows: Iterable[Sequence[float]]) -> None:
+        """Добавить в пачку несколько тренировок."""
+        for data in rows:
+            self.append(data)
+
+    def compute(self) -> BatchResult:
+        """Рассчитать показатели всех тренировок пачки."""
+        return self.training_class.compute_batch(
+            zip(*self.columns.values())
+        )
+
 
 def read_package(workout_type: str, data: List[int]) -> Training:
     """Прочитать данные полученные от датчиков
     и вернуть объект тренировки."""
-    code_workout: Dict[str, Type[Training]] = {
-        'RUN': Running,
-        'WLK': SportsWalking,
-        'SWM': Swimming
-    }
-
-    if workout_type in code_workout:
-        workout_object = code_workout[workout_type](*data)
+    training_class = CODE_WORKOUT.get(workout_type)
+    if training_class is not None:
+        workout_object = training_class(*data)
         return workout_object
     else:
         print(f'{workout_type} - недопустимый код тренировки!')
 
 
+def read_packages(packages: Iterable[Tuple[str, Sequence[float]]]
+                  ) -> Iterator[Training]:
+    """Прочитать поток пакетов и вернуть объекты тренировок.
+
+    Пакеты с неизвестным кодом пропускаются с тем же сообщением,
+    что выводит read_package.
+    """
+    lookup = CODE_WORKOUT.get
+    for workout_type, data in packages:
+        training_class = lookup(workout_type)
+        if training_class is not None:
+            yield training_class(*data)
+        else:
+            print(f'{workout_type} - недопустимый код тренировки!')
+
+
+def compute_batch(workout_type: str,
+                  rows: Iterable[Sequence[float]]
+                  ) -> BatchResult:
+    """Рассчитать дистанцию, скорость и калории для пачки пакетов
+    одного типа тренировки."""
+    if workout_type not in CODE_WORKOUT:
+        raise ValueError(f'{workout_type} - недопустимый код тренировки!')
+    return CODE_WORKOUT[workout_type].compute_batch(rows)
+
+
+def compute_messages(packages: Iterable[Tuple[str, Sequence[float]]]
+                     ) -> List[InfoMessage]:
+    """Рассчитать сообщения для пакетов через compute_batch.
+
+    Пакеты группируются по типу тренировки, а сообщения
+    возвращаются в порядке исходных пакетов.
+    """
+    groups: Dict[str, Tuple[List[int], List[Sequence[float]]]] = {}
+    count = 0
+    for workout_type, data in packages:
+        group = groups.get(workout_type)
+        if group is None:
+            group = groups[workout_type] = ([], [])
+        group[0].append(count)
+        group[1].append(data)
+        count += 1
+    messages: List[Any] = [None] * count
+    for workout_type, (indices, rows) in groups.items():
+        name = CODE_WORKOUT.get(workout_type, Training).__name__
+        distances, speeds, calories = compute_batch(workout_type, rows)
+        for index, data, distance, speed, spent in zip(
+                indices, rows, distances, speeds, calories):
+            messages[index] = InfoMessage(name, data[1],
+                                          distance, speed, spent)
+    return messages
+
+
+def process(workout_type: str, data: Sequence[float]) -> InfoMessage:
+    """Рассчитать сообщение о тренировке для одного пакета.
+
+    В отличие от read_package ничего не выводит, а для неизвестного
+    кода вызывает ValueError. Общее состояние модуля только читается,
+    поэтому функцию можно вызывать из нескольких потоков.
+    """
+    training_class = CODE_WORKOUT.get(workout_type)
+    if training_class is None:
+        raise ValueError(f'{workout_type} - недопустимый код тренировки!')
+    return training_class(*data).show_training_info()
+
+
+def process_many(packages: Iterable[Tuple[str, Sequence[float]]]
+                 ) -> List[InfoMessage]:
+    """Рассчитать сообщения для пачки пакетов без вывода на экран.
+
+    Расчёт выполняется через compute_messages и безопасен
+    для вызова из нескольких потоков, как и process.
+    """
+    return compute_messages(packages)
+
+
 def main(training: Training) -> None:
     """Главная функция."""
     try:
@@ -167,12 +640,11 @@ def main(training: Training) -> None:
 
 
 if __name__ == '__main__':
-    packages: List[Tuple[str, List[int]]] = [
-        ('SWM', [720, 1, 80, 25, 40]),
-        ('RUN', [15000, 1, 75]),
-        ('WLK', [9000, 1, 75, 180]),
-    ]
+    import sys
 
-    for workout_type, data in packages:
-        training = read_package(workout_type, data)
-        main(training)
+    # cli импортирует homework по имени: без этого при запуске
+    # `python -m homework` модуль загружался бы второй раз.
+    sys.modules.setdefault('homework', sys.modules[__name__])
+    from cli import main as cli_main
+
+    raise SystemExit(cli_main())
@@ -0,0 +1,273 @@
+"""Счётчики и гистограммы задержек для этапов обработки пакетов.
+
+Пока instrument() не активен, код homework.py не изменяется, поэтому
+выключенная инструментация ничего не стоит. Внутри контекста методы
+этапов временно заменяются обёртками, замеряющими время вызова.
+Этап read_package учитывает вызовы read_package и пакеты, прочитанные
+через read_packages, в том числе в модулях, импортировавших эти
+функции по имени (package_io, server, cli и другие).
+
+Метка workout_type на всех этапах - имя класса тренировки. Коды
+пакетов переводятся в имена через CODE_WORKOUT, а неизвестные коды
+учитываются под одной меткой UNKNOWN.
+"""
+import json
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import homework
+
+BUCKETS: Tuple[float, ...] = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5,
+    1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 1e-1,
+)
+
+UNKNOWN = 'unknown'
+
+Label = Tuple[str, str]
+Wrapper = Callable[..., Callable[..., Any]]
+Target = Tuple[Any, str, str, Callable[..., str], Wrapper]
+
+
+def escape_label(value: str) -> str:
+    """Экранировать значение метки для текстового формата Prometheus."""
+    return (value.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+class Histogram:
+    """Гистограмма задержек с фиксированными границами корзин."""
+
+    __slots__ = ('buckets', 'total', 'count')
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        """Учесть одно измерение."""
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+
+class Instrumentation:
+    """Метрики этапов конвейера с разбивкой по типам тренировок."""
+
+    def __init__(self) -> None:
+        self.histograms: Dict[Label, Histogram] = {}
+        self.errors: Counter = Counter()
+
+    def observe(self, stage: str, workout_type: str, seconds: float) -> None:
+        """Учесть вызов этапа stage для тренировки workout_type."""
+        key = (stage, workout_type)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Представить метрики в виде, пригодном для JSON."""
+        stages: List[Dict[str, Any]] = []
+        for (stage, workout_type), histogram in self.histograms.items():
+            stages.append({
+                'stage': stage,
+                'workout_type': workout_type,
+                'count': histogram.count,
+                'sum_seconds': histogram.total,
+                'buckets': dict(zip([str(le) for le in BUCKETS] + ['+Inf'],
+                                    histogram.buckets)),
+            })
+        errors = [{'stage': stage, 'workout_type': workout_type,
+                   'count': count}
+                  for (stage, workout_type), count in self.errors.items()]
+        return {'stages': stages, 'errors': errors}
+
+    def to_prometheus(self) -> str:
+        """Представить метрики в текстовом формате Prometheus."""
+        lines = [
+            '# HELP workout_stage_seconds Latency of pipeline stages.',
+            '# TYPE workout_stage_seconds histogram',
+        ]
+        for (stage, workout_type), histogram in self.histograms.items():
+            labels = (f'stage="{escape_label(stage)}",'
+                      f'workout_type="{escape_label(workout_type)}"')
+            cumulative = 0
+            for le, count in zip(BUCKETS + ('+Inf',), histogram.buckets):
+                cumulative += count
+                lines.append(f'workout_stage_seconds_bucket'
+                             f'{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'workout_stage_seconds_sum{{{labels}}} '
+                         f'{histogram.total!r}')
+            lines.append(f'workout_stage_seconds_count{{{labels}}} '
+                         f'{histogram.count}')
+        lines.append('# HELP workout_stage_errors_total '
+                     'Exceptions raised by pipeline stages.')
+        lines.append('# TYPE workout_stage_errors_total counter')
+        for (stage, workout_type), count in self.errors.items():
+            lines.append(f'workout_stage_errors_total'
+                         f'{{stage="{escape_label(stage)}",'
+                         f'workout_type="{escape_label(workout_type)}"}} '
+                         f'{count}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str, fmt: str = 'prometheus') -> None:
+        """Записать метрики в файл в формате prometheus или json."""
+        with open(path, 'w', encoding='utf-8') as stream:
+            if fmt == 'json':
+                json.dump(self.to_dict(), stream, indent=2)
+            else:
+                stream.write(self.to_prometheus())
+
+
+def timed(metrics: Instrumentation,
+          stage: str,
+          label: Callable[..., str],
+          func: Callable[..., Any]) -> Callable[..., Any]:
+    """Обернуть func замером времени этапа stage."""
+    clock = time.perf_counter
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            metrics.errors[stage, label(*args)] += 1
+            raise
+        finally:
+            metrics.observe(stage, label(*args), clock() - start)
+    return wrapper
+
+
+def timed_packages(metrics: Instrumentation,
+                   stage: str,
+                   label: Callable[..., str],
+                   func: Callable[..., Any]) -> Callable[..., Any]:
+    """Обернуть генератор func, читающий пакеты, замером каждого пакета.
+
+    Пакеты передаются в func по одному, поэтому вывод и пропуск
+    неизвестных кодов остаются прежними.
+    """
+    clock = time.perf_counter
+
+    @wraps(func)
+    def wrapper(packages: Any) -> Iterator[Any]:
+        for package in packages:
+            start = clock()
+            try:
+                results = list(func([package]))
+            except Exception:
+                metrics.errors[stage, label(*package)] += 1
+                raise
+            finally:
+                metrics.observe(stage, label(*package), clock() - start)
+            yield from results
+    return wrapper
+
+
+def package_label(workout_type: Any, *args: Any) -> str:
+    """Получить тип тренировки по аргументам чтения пакета.
+
+    Код переводится в имя класса, как у остальных этапов. Коды
+    приходят из входных данных, поэтому все неизвестные коды
+    учитываются под одной меткой и не порождают новых рядов.
+    """
+    if type(workout_type) is str:
+        training_class = homework.CODE_WORKOUT.get(workout_type)
+        if training_class is not None:
+            return training_class.__name__
+    return UNKNOWN
+
+
+def class_label(self: Any, *args: Any) -> str:
+    """Получить тип тренировки по объекту, у которого вызван метод."""
+    return type(self).__name__
+
+
+def patch_targets() -> List[Target]:
+    """Перечислить заменяемые атрибуты, этапы, способы получить
+    тип тренировки и обёртки.
+
+    Калории в show_training_info считаются через _spent_calories,
+    поэтому этап get_spent_calories замеряется на нём.
+    """
+    targets: List[Target] = [
+        (homework.Training, 'show_training_info', 'show_training_info',
+         class_label, timed),
+        (homework.InfoMessage, 'get_message', 'get_message',
+         lambda message: message.training_type, timed),
+    ]
+    readers = (('read_package', homework.read_package, timed),
+               ('read_packages', homework.read_packages, timed_packages))
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, '__dict__', None) or {}
+        for name, func, wrapper in readers:
+            if namespace.get(name) is func:
+                targets.append((module, name, 'read_package',
+                                package_label, wrapper))
+    for training_class in homework.CODE_WORKOUT.values():
+        if '_spent_calories' in vars(training_class):
+            targets.append((training_class, '_spent_calories',
+                            'get_spent_calories', class_label, timed))
+    return targets
+
+
+@contextmanager
+def instrument(metrics: Optional[Instrumentation] = None
+               ) -> Iterator[Instrumentation]:
+    """Включить сбор метрик на время выполнения блока with."""
+    metrics = metrics or Instrumentation()
+    originals = []
+    for owner, name, stage, label, wrapper in patch_targets():
+        original = vars(owner)[name]
+        originals.append((owner, name, original))
+        setattr(owner, name, wrapper(metrics, stage, label, original))
+    try:
+        yield metrics
+    finally:
+        for owner, name, original in reversed(originals):
+            setattr(owner, name, original)
+
+
+@contextmanager
+def sampling_profiler(path: str,
+                      interval: float = 0.005) -> Iterator[Counter]:
+    """Периодически снимать стек текущего потока.
+
+    Стеки записываются в path в свёрнутом формате
+    (`модуль:функция;...;модуль:функция число`), пригодном
+    для построения flame graph.
+    """
+    target = threading.get_ident()
+    samples: Counter = Counter()
+    stop = threading.Event()
+
+    def sample() -> None:
+        while not stop.wait(interval):
+            frame = sys._current_frames().get(target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{frame.f_globals.get("__name__")}:'
+                             f'{code.co_name}')
+                frame = frame.f_back
+            samples[';'.join(reversed(stack))] += 1
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        yield samples
+    finally:
+        stop.set()
+        sampler.join()
+        with open(path, 'w', encoding='utf-8') as stream:
+            for stack, count in samples.most_common():
+                stream.write(f'{stack} {count}\n')
@@ -0,0 +1,171 @@
+import csv
+import json
+import sys
+from itertools import islice
+from typing import (Callable, Dict, IO, Iterable, Iterator, List, Optional,
+                    TextIO, Tuple, Union)
+
+from homework import InfoMessage, read_packages
+
+Package = Tuple[str, List[float]]
+ErrorHandler = Callable[[str], None]
+
+DEFAULT_BUFFER_SIZE: int = 64 * 1024
+
+
+def parse_number(value: str) -> float:
+    """Преобразовать строку из пакета в число."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def read_csv_packages(lines: Iterable[str],
+                      on_error: Optional[ErrorHandler] = None
+                      ) -> Iterator[Package]:
+    """Читать пакеты из строк вида `RUN,15000,1,75`.
+
+    Если передан on_error, строки с нечисловыми значениями передаются
+    в него и пропускаются, иначе возникает ValueError.
+    """
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        try:
+            data = [parse_number(value) for value in row[1:]]
+        except ValueError:
+            if on_error is None:
+                raise
+            on_error(','.join(row))
+            continue
+        yield row[0].strip(), data
+
+
+def read_jsonl_packages(lines: Iterable[str],
+                        on_error: Optional[ErrorHandler] = None
+                        ) -> Iterator[Package]:
+    """Читать пакеты из строк JSON Lines.
+
+    Строка может быть списком `["RUN", [15000, 1, 75]]`
+    или объектом `{"workout_type": "RUN", "data": [15000, 1, 75]}`.
+    Если передан on_error, строки, которые не удалось разобрать,
+    передаются в него и пропускаются.
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            package = parse_json_package(line)
+        except (ValueError, KeyError, TypeError):
+            if on_error is None:
+                raise
+            on_error(line.rstrip('\r\n'))
+            continue
+        yield package
+
+
+def parse_json_package(line: Union[str, bytes]) -> Package:
+    """Разобрать один пакет в формате JSON."""
+    record = json.loads(line)
+    if isinstance(record, dict):
+        return record['workout_type'], record['data']
+    workout_type, data = record
+    return workout_type, data
+
+
+Reader = Callable[[Iterable[str], Optional[ErrorHandler]], Iterator[Package]]
+
+READERS: Dict[str, Reader] = {
+    'csv': read_csv_packages,
+    'jsonl': read_jsonl_packages,
+}
+
+
+def iter_packages(source: Union[str, TextIO],
+                  fmt: str = 'csv',
+                  on_error: Optional[ErrorHandler] = None
+                  ) -> Iterator[Package]:
+    """Лениво читать пакеты из файла, потока или stdin (`-`).
+
+    on_error получает строки, которые не удалось разобрать.
+    """
+    reader = READERS[fmt]
+    if source == '-':
+        yield from reader(sys.stdin, on_error)
+    elif isinstance(source, str):
+        with open(source, encoding='utf-8', newline='') as stream:
+            yield from reader(stream, on_error)
+    else:
+        yield from reader(source, on_error)
+
+
+def chunked(packages: Iterable[Package],
+            chunk_size: int) -> Iterator[List[Package]]:
+    """Разбить поток пакетов на списки длиной не более chunk_size."""
+    iterator = iter(packages)
+    chunk = list(islice(iterator, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, chunk_size))
+
+
+def process_packages(packages: Iterable[Package]) -> Iterator[InfoMessage]:
+    """Превратить поток пакетов в поток информационных сообщений."""
+    for training in read_packages(packages):
+        yield training.show_training_info()
+
+
+def write_messages(messages: Iterable[InfoMessage],
+                   out: IO[str],
+                   buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+    """Записать сообщения в поток крупными блоками.
+
+    Возвращает количество записанных сообщений.
+    """
+    chunk: List[str] = []
+    chunk_size = 0
+    count = 0
+    for message in messages:
+        line = message.get_message() + '\n'
+        chunk.append(line)
+        chunk_size += len(line)
+        count += 1
+        if chunk_size >= buffer_size:
+            out.write(''.join(chunk))
+            chunk.clear()
+            chunk_size = 0
+    if chunk:
+        out.write(''.join(chunk))
+    return count
+
+
+def write_csv_messages(messages: Iterable[InfoMessage], out: IO[str]) -> int:
+    """Записать поля сообщений в CSV с заголовком."""
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(InfoMessage.__slots__)
+    count = 0
+    for message in messages:
+        writer.writerow([message.training_type, message.duration,
+                         message.distance, message.speed, message.calories])
+        count += 1
+    return count
+
+
+def write_jsonl_messages(messages: Iterable[InfoMessage],
+                         out: IO[str]) -> int:
+    """Записать поля сообщений в формате JSON Lines."""
+    count = 0
+    for message in messages:
+        record = {name: getattr(message, name)
+                  for name in InfoMessage.__slots__}
+        out.write(json.dumps(record, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+WRITERS: Dict[str, Callable[[Iterable[InfoMessage], IO[str]], int]] = {
+    'text': write_messages,
+    'csv': write_csv_messages,
+    'jsonl': write_jsonl_messages,
+}
@@ -0,0 +1,223 @@
+"""Компактный двоичный формат пакетов.
+
+Файл начинается с заголовка MAGIC, за которым идут записи. Каждое
+значение пакета хранится в самом узком типе, в котором оно
+представимо без потерь: целые - uint16, uint32 или int64, дробные -
+сотые доли в uint16 или uint32 (виды C и D), float32 или float64.
+Набор видов значений вместе с кодом тренировки образует раскладку
+записи.
+
+Запись начинается с байта-тега раскладки. Тег 0 объявляет новую
+раскладку: за ним идут код тренировки (3 байта ASCII), число значений
+(1 байт) и по символу вида на каждое значение. Объявленные раскладки
+получают теги 1, 2, ... в порядке появления, а запись с таким тегом
+содержит только значения пакета. Все числа записаны в порядке
+little-endian.
+
+Пакет `RUN,15000,1,75` занимает 7 байт вместо 15 в CSV,
+а `SWM,1922,0.32,110,50,61` - 11 байт вместо 24.
+"""
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from typing import (IO, Dict, Iterable, Iterator, List, Tuple, Type,
+                    Union)
+
+import homework
+from homework import Training, TrainingBatch
+from package_io import Package
+
+MAGIC: bytes = b'WKTPKG2\n'
+DEFINE: int = 0
+MAX_LAYOUTS: int = 255
+MAX_VALUES: int = 5
+CODE_SIZE: int = 3
+CHUNK_RECORDS: int = 4096
+HEADER = struct.Struct('<B3sB')
+INTEGER_KINDS = (('H', 0, 0xFFFF), ('I', 0, 0xFFFFFFFF),
+                 ('q', -2**63, 2**63 - 1))
+FLOAT32 = struct.Struct('<f')
+CENTS: int = 100
+CENT_KINDS = (('C', 0xFFFF), ('D', 0xFFFFFFFF))
+STRUCT_CODES = {'C': 'H', 'D': 'I'}
+KINDS = 'HIqCDfd'
+
+Buffer = Union[bytes, memoryview, mmap.mmap]
+Layout = Tuple[str, str]
+
+
+def value_kind(value: float) -> str:
+    """Выбрать самый узкий тип struct, хранящий value без потерь."""
+    if isinstance(value, int):
+        for kind, low, high in INTEGER_KINDS:
+            if low <= value <= high:
+                return kind
+        raise ValueError(f'значение {value} не помещается в int64')
+    try:
+        cents = round(value * CENTS)
+        if cents / CENTS == value:
+            for kind, high in CENT_KINDS:
+                if 0 <= cents <= high:
+                    return kind
+        if FLOAT32.unpack(FLOAT32.pack(value))[0] == value:
+            return 'f'
+    except (OverflowError, ValueError):
+        pass
+    return 'd'
+
+
+def record_struct(kinds: str) -> struct.Struct:
+    """Получить struct записи с тегом для строки видов значений."""
+    if not set(kinds) <= set(KINDS):
+        raise ValueError(f'неизвестные виды значений: {kinds!r}')
+    return struct.Struct('<B' + ''.join(STRUCT_CODES.get(kind, kind)
+                                        for kind in kinds))
+
+
+def encode_code(workout_type: str) -> bytes:
+    """Проверить и закодировать код тренировки."""
+    code = workout_type.encode('ascii')
+    if len(code) != CODE_SIZE:
+        raise ValueError(f'код тренировки {workout_type!r} должен '
+                         f'состоять из {CODE_SIZE} символов ASCII')
+    return code
+
+
+class Encoder:
+    """Кодировщик пакетов, запоминающий объявленные раскладки."""
+
+    def __init__(self) -> None:
+        self.tags: Dict[Layout, int] = {}
+        self.records: List[Tuple[struct.Struct, Tuple[int, ...]]] = []
+
+    def encode(self, workout_type: str, data: Iterable[float]) -> bytes:
+        """Упаковать один пакет, при необходимости объявив раскладку."""
+        values = list(data)
+        if not 1 <= len(values) <= MAX_VALUES:
+            raise ValueError(f'пакет {workout_type} содержит '
+                             f'{len(values)} значений')
+        kinds = ''.join(value_kind(value) for value in values)
+        layout = (workout_type, kinds)
+        tag = self.tags.get(layout)
+        prefix = b''
+        if tag is None:
+            if len(self.tags) >= MAX_LAYOUTS:
+                raise ValueError('слишком много раскладок записей')
+            prefix = (HEADER.pack(DEFINE, encode_code(workout_type),
+                                  len(kinds)) + kinds.encode('ascii'))
+            tag = self.tags[layout] = len(self.tags) + 1
+            self.records.append((record_struct(kinds), tuple(
+                index for index, kind in enumerate(kinds) if kind in 'CD'
+            )))
+        record, cents = self.records[tag - 1]
+        for index in cents:
+            values[index] = round(values[index] * CENTS)
+        return prefix + record.pack(tag, *values)
+
+
+def encode_package(workout_type: str, data: Iterable[float]) -> bytes:
+    """Упаковать один пакет вместе с объявлением его раскладки."""
+    return Encoder().encode(workout_type, data)
+
+
+def write_packages(packages: Iterable[Package], out: IO[bytes]) -> int:
+    """Записать заголовок и пакеты в двоичный поток.
+
+    Возвращает количество записанных пакетов.
+    """
+    out.write(MAGIC)
+    encoder = Encoder()
+    chunk = []
+    count = 0
+    for workout_type, data in packages:
+        chunk.append(encoder.encode(workout_type, data))
+        count += 1
+        if len(chunk) >= CHUNK_RECORDS:
+            out.write(b''.join(chunk))
+            chunk.clear()
+    out.write(b''.join(chunk))
+    return count
+
+
+def iter_records(buffer: Buffer) -> Iterator[Tuple[str, Tuple[float, ...]]]:
+    """Итерироваться по записям буфера без копирования данных.
+
+    Генератор не держит ссылок на буфер между записями, поэтому
+    отображение файла можно закрыть, не дочитав его.
+    """
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError('неизвестный формат файла пакетов')
+    layouts: List[Tuple[str, struct.Struct, Tuple[int, ...]]] = []
+    offset = len(MAGIC)
+    size = len(buffer)
+    try:
+        while offset < size:
+            tag = buffer[offset]
+            if tag == DEFINE:
+                _, code, count = HEADER.unpack_from(buffer, offset)
+                offset += HEADER.size
+                kinds = bytes(buffer[offset:offset + count]).decode('ascii')
+                offset += count
+                layouts.append((code.decode('ascii'), record_struct(kinds),
+                                tuple(index for index, kind in enumerate(kinds)
+                                      if kind in 'CD')))
+                continue
+            workout_type, record, cents = layouts[tag - 1]
+            values = record.unpack_from(buffer, offset)[1:]
+            if cents:
+                values = tuple(value / CENTS if index in cents else value
+                               for index, value in enumerate(values))
+            yield workout_type, values
+            offset += record.size
+    except (IndexError, KeyError, struct.error, UnicodeDecodeError):
+        raise ValueError('файл пакетов обрезан или повреждён')
+
+
+def iter_packages(buffer: Buffer) -> Iterator[Package]:
+    """Читать пакеты в виде (код тренировки, данные)."""
+    for workout_type, values in iter_records(buffer):
+        yield workout_type, list(values)
+
+
+def training_class(workout_type: str) -> Type[Training]:
+    """Найти класс тренировки в реестре на момент чтения."""
+    found = homework.CODE_WORKOUT.get(workout_type)
+    if found is None:
+        raise ValueError(f'{workout_type} - недопустимый код тренировки!')
+    return found
+
+
+def iter_trainings(buffer: Buffer) -> Iterator[Training]:
+    """Создавать объекты тренировок прямо из записей буфера."""
+    for workout_type, values in iter_records(buffer):
+        yield training_class(workout_type)(*values)
+
+
+def load_batches(buffer: Buffer) -> Dict[str, TrainingBatch]:
+    """Разложить записи буфера по пачкам TrainingBatch."""
+    batches: Dict[str, TrainingBatch] = {}
+    for workout_type, values in iter_records(buffer):
+        batch = batches.get(workout_type)
+        if batch is None:
+            batch = batches[workout_type] = TrainingBatch(
+                training_class(workout_type)
+            )
+        batch.append(values)
+    return batches
+
+
+@contextmanager
+def map_file(path: str) -> Iterator[mmap.mmap]:
+    """Отобразить файл пакетов в память только для чтения.
+
+    Функции чтения обращаются к отображению напрямую и не создают
+    memoryview, поэтому выход из блока with не зависит от того,
+    дочитаны ли записи. Пустой файл не может быть отображён и не
+    содержит заголовка, поэтому для него вызывается ValueError.
+    """
+    with open(path, 'rb') as stream:
+        if not os.fstat(stream.fileno()).st_size:
+            raise ValueError('неизвестный формат файла пакетов')
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
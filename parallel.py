@@ -0,0 +1,52 @@
+import os
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                as_completed, wait)
+from typing import Deque, Iterable, Iterator, List, Optional, Set
+
+from homework import InfoMessage, compute_messages
+from package_io import Package, chunked, process_packages
+
+DEFAULT_CHUNK_SIZE: int = 1000
+
+
+def process_chunk(chunk: List[Package]) -> List[InfoMessage]:
+    """Обработать один блок пакетов в процессе-исполнителе."""
+    return list(process_packages(chunk))
+
+
+def process_parallel(packages: Iterable[Package],
+                     workers: Optional[int] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     ordered: bool = True,
+                     batch: bool = False) -> Iterator[InfoMessage]:
+    """Обработать поток пакетов в пуле процессов.
+
+    В работе одновременно находится не более двух блоков на процесс,
+    поэтому память не зависит от длины входного потока. При
+    ordered=True сообщения возвращаются в порядке входных пакетов,
+    при batch=True блоки считаются через compute_messages.
+    """
+    worker = compute_messages if batch else process_chunk
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+    chunks = chunked(packages, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if ordered:
+            queue: Deque[Future] = deque()
+            for chunk in chunks:
+                queue.append(executor.submit(worker, chunk))
+                if len(queue) >= max_pending:
+                    yield from queue.popleft().result()
+            while queue:
+                yield from queue.popleft().result()
+        else:
+            pending: Set[Future] = set()
+            for chunk in chunks:
+                pending.add(executor.submit(worker, chunk))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            for future in as_completed(pending):
+                yield from future.result()
@@ -0,0 +1,99 @@
+"""Компактное хранение результатов с пониженной точностью.
+
+Показатели по-прежнему считаются в float64 по формулам классов,
+а для хранения упаковываются в один из режимов:
+
+* `float32` - массив `array('f')`, вдвое меньше float64. Относительная
+  ошибка не больше 2**-24 (около 6e-8), если значение по модулю
+  меньше 3.4e38.
+* `fixed` - целые числа с масштабом scale (`round(value * scale)`)
+  в массиве `array('i')` (4 байта) или `array('h')` (2 байта).
+  Абсолютная ошибка не больше 0.5 / scale, суммы по колонке
+  считаются без накопления ошибки округления. При выходе за диапазон
+  типа возникает OverflowError.
+"""
+from array import array
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from homework import compute_batch
+
+MODES = ('float32', 'fixed')
+DEFAULT_SCALE: int = 1000
+FIELDS = ('distance', 'speed', 'calories')
+
+
+def float32_error_bound(value: float) -> float:
+    """Максимальная абсолютная ошибка хранения value во float32."""
+    return abs(value) * 2.0 ** -24
+
+
+def fixed_error_bound(scale: int = DEFAULT_SCALE) -> float:
+    """Максимальная абсолютная ошибка хранения с масштабом scale."""
+    return 0.5 / scale
+
+
+def pack(values: Iterable[float],
+         mode: str = 'float32',
+         scale: int = DEFAULT_SCALE,
+         typecode: str = 'i') -> array:
+    """Упаковать значения в массив выбранного режима."""
+    if mode == 'float32':
+        return array('f', values)
+    if mode == 'fixed':
+        return array(typecode, [round(value * scale) for value in values])
+    raise ValueError(f'неизвестный режим точности: {mode}')
+
+
+def unpack(packed: array, scale: int = DEFAULT_SCALE) -> Iterator[float]:
+    """Восстановить значения float из упакованного массива."""
+    if packed.typecode == 'f':
+        return iter(packed)
+    return (value / scale for value in packed)
+
+
+class CompactResults:
+    """Колонки дистанции, скорости и калорий пониженной точности."""
+
+    def __init__(self,
+                 mode: str = 'float32',
+                 scale: int = DEFAULT_SCALE,
+                 typecode: str = 'i') -> None:
+        if mode not in MODES:
+            raise ValueError(f'неизвестный режим точности: {mode}')
+        self.mode = mode
+        self.scale = scale
+        self.typecode = 'f' if mode == 'float32' else typecode
+        self.columns: Dict[str, array] = {
+            field: array(self.typecode) for field in FIELDS
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns['calories'])
+
+    def extend(self, workout_type: str,
+               rows: Iterable[Sequence[float]]) -> None:
+        """Рассчитать пакеты одного типа и добавить результаты.
+
+        Все колонки упаковываются до изменения, поэтому при
+        OverflowError длины колонок остаются прежними.
+        """
+        packed = [pack(values, self.mode, self.scale, self.typecode)
+                  for values in compute_batch(workout_type, rows)]
+        for field, values in zip(FIELDS, packed):
+            self.columns[field].extend(values)
+
+    def values(self, field: str) -> List[float]:
+        """Получить значения колонки field в виде float."""
+        return list(unpack(self.columns[field], self.scale))
+
+    def total(self, field: str) -> float:
+        """Сумма колонки; для fixed считается точно в целых числах."""
+        column = self.columns[field]
+        if self.mode == 'fixed':
+            return sum(column) / self.scale
+        return sum(column)
+
+    def nbytes(self) -> int:
+        """Объём данных колонок в байтах."""
+        return sum(column.itemsize * len(column)
+                   for column in self.columns.values())
@@ -0,0 +1,142 @@
+"""LRU-кэш результатов для повторяющихся пакетов."""
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import (Any, Callable, Dict, Hashable, Iterable, Optional,
+                    Sequence, Tuple)
+
+from homework import InfoMessage, read_package
+
+CacheKey = Tuple[str, Tuple[Hashable, ...]]
+
+
+def package_key(workout_type: str, data: Sequence[float]) -> CacheKey:
+    """Нормализовать пакет в ключ кэша.
+
+    Значения 1 и 1.0 дают одинаковый ключ, так как равны и имеют
+    одинаковый хэш.
+    """
+    return workout_type, tuple(data)
+
+
+class ResultCache:
+    """Ограниченный по размеру кэш InfoMessage с вытеснением LRU.
+
+    Возвращаемые сообщения разделяются между вызовами, поэтому
+    изменять их нельзя.
+    """
+
+    def __init__(self,
+                 max_size: int = 10000,
+                 ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.time,
+                 ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.entries: 'OrderedDict[CacheKey, Tuple[float, InfoMessage]]' = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self,
+            workout_type: str,
+            data: Sequence[float]) -> Optional[InfoMessage]:
+        """Вернуть сохранённое сообщение или None."""
+        key = package_key(workout_type, data)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, info = entry
+        if expires < self.clock():
+            del self.entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return info
+
+    def put(self,
+            workout_type: str,
+            data: Sequence[float],
+            info: InfoMessage) -> None:
+        """Сохранить сообщение для пакета."""
+        expires = self.clock() + self.ttl if self.ttl else float('inf')
+        self._store(package_key(workout_type, data), expires, info)
+
+    def _store(self, key: CacheKey, expires: float, info: InfoMessage) -> None:
+        self.entries[key] = (expires, info)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def process(self,
+                workout_type: str,
+                data: Sequence[float]) -> Optional[InfoMessage]:
+        """Вернуть сообщение о тренировке, рассчитав его при промахе."""
+        info = self.get(workout_type, data)
+        if info is None:
+            training = read_package(workout_type, data)
+            if training is None:
+                return None
+            info = training.show_training_info()
+            self.put(workout_type, data, info)
+        return info
+
+    def stats(self) -> Dict[str, Any]:
+        """Получить статистику попаданий и вытеснений."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+    def save(self, path: str) -> None:
+        """Атомарно записать содержимое кэша в файл JSON Lines."""
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as stream:
+            for (workout_type, data), (expires, info) in self.entries.items():
+                record = {
+                    'workout_type': workout_type,
+                    'data': data,
+                    'expires': expires if expires != float('inf') else None,
+                    'info': [getattr(info, name)
+                             for name in InfoMessage.__slots__],
+                }
+                stream.write(json.dumps(record) + '\n')
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> int:
+        """Загрузить непросроченные записи из файла, созданного save.
+
+        Возвращает количество загруженных записей.
+        """
+        now = self.clock()
+        loaded = 0
+        with open(path, encoding='utf-8') as stream:
+            records: Iterable[Dict[str, Any]] = map(json.loads, stream)
+            for record in records:
+                expires = record['expires']
+                if expires is None:
+                    expires = float('inf')
+                elif expires < now:
+                    continue
+                key = package_key(record['workout_type'], record['data'])
+                self._store(key, expires, InfoMessage(*record['info']))
+                loaded += 1
+        return loaded
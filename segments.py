@@ -0,0 +1,63 @@
+"""Потоковый расчёт тренировки по промежуточным замерам.
+
+Трекер присылает замеры `(timestamp, action_delta)`, а для плавания
+ещё и число пройденных бассейнов. Каждый замер обновляет суммарные
+параметры тренировки за O(1), а показатели пересчитываются по тем же
+формулам классов homework.py только при запросе.
+"""
+from typing import Iterable, Tuple
+
+from homework import CODE_WORKOUT, InfoMessage, Swimming, Training
+
+SECONDS_IN_HOUR: int = 60 * 60
+
+Sample = Tuple[float, int]
+
+
+class LiveTraining:
+    """Тренировка, обновляемая по мере поступления замеров."""
+
+    def __init__(self, training: Training, start: float) -> None:
+        self.training = training
+        self.start = start
+        self.last = start
+        self.samples = 0
+
+    def add_sample(self,
+                   timestamp: float,
+                   action_delta: int = 0,
+                   laps_delta: int = 0) -> None:
+        """Учесть замер, полученный в момент timestamp (в секундах)."""
+        training = self.training
+        if action_delta:
+            training.action += action_delta
+        if laps_delta:
+            training.count_pool += laps_delta
+        if timestamp > self.last:
+            self.last = timestamp
+            training.duration = (timestamp - self.start) / SECONDS_IN_HOUR
+        self.samples += 1
+
+    def add_samples(self, samples: Iterable[Sample]) -> None:
+        """Учесть последовательность замеров."""
+        for sample in samples:
+            self.add_sample(*sample)
+
+    def show_training_info(self) -> InfoMessage:
+        """Вернуть сообщение о тренировке на момент последнего замера."""
+        return self.training.show_training_info()
+
+
+def start_training(workout_type: str,
+                   start: float,
+                   weight: float,
+                   *params: float) -> LiveTraining:
+    """Начать тренировку с нулевыми шагами и длительностью.
+
+    params - дополнительные параметры класса тренировки, кроме числа
+    бассейнов для плавания: оно накапливается из замеров.
+    """
+    training_class = CODE_WORKOUT[workout_type]
+    if issubclass(training_class, Swimming):
+        params = params + (0,)
+    return LiveTraining(training_class(0, 0, weight, *params), start)
@@ -0,0 +1,128 @@
+"""Asyncio-сервер для приёма пакетов от трекеров.
+
+Протокол построчный: клиент отправляет пакет в формате JSON
+(`["RUN", [15000, 1, 75]]` или `{"workout_type": ..., "data": ...}`),
+сервер отвечает строкой JSON с полями InfoMessage или с полем `error`.
+"""
+import argparse
+import asyncio
+import json
+from typing import List, Optional
+
+from homework import InfoMessage, read_package
+from package_io import parse_json_package
+from validation import PARSE_ERROR, check_package, check_result
+
+DEFAULT_MAX_CONNECTIONS: int = 1000
+DEFAULT_MAX_LINE: int = 64 * 1024
+
+
+def error_reply(reason: str) -> bytes:
+    """Строка ответа с кодом причины отказа."""
+    return json.dumps({'error': reason}).encode() + b'\n'
+
+
+def process_frame(line: bytes) -> bytes:
+    """Обработать один пакет и вернуть строку ответа.
+
+    Пакет проходит check_package до расчёта, поэтому на любой
+    отклонённый пакет сервер отвечает `{"error": <причина>}`.
+    """
+    try:
+        workout_type, data = parse_json_package(line)
+    except (ValueError, KeyError, TypeError):
+        return error_reply(PARSE_ERROR)
+    reason = check_package(workout_type, data)
+    if reason is not None:
+        return error_reply(reason)
+    info = read_package(workout_type, data).show_training_info()
+    reason = check_result(info)
+    if reason is not None:
+        return error_reply(reason)
+    reply = {name: getattr(info, name) for name in InfoMessage.__slots__}
+    return json.dumps(reply, ensure_ascii=False).encode() + b'\n'
+
+
+class PackageServer:
+    """Сервер пакетов с ограничением числа одновременных соединений.
+
+    Соединения сверх max_connections ждут освобождения слота, а ответы
+    не отправляются быстрее, чем клиент успевает их читать.
+    """
+
+    def __init__(self,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 max_line: int = DEFAULT_MAX_LINE,
+                 ) -> None:
+        self.max_connections = max_connections
+        self.max_line = max_line
+        self.processed = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def handle(self,
+                     reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter,
+                     ) -> None:
+        """Обслужить одно соединение до его закрытия клиентом."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_connections)
+        async with self._slots:
+            try:
+                while True:
+                    try:
+                        line = await reader.readline()
+                    except ValueError:
+                        writer.write(b'{"error": "line too long"}\n')
+                        break
+                    if not line:
+                        break
+                    if not line.strip():
+                        continue
+                    writer.write(process_frame(line))
+                    self.processed += 1
+                    await writer.drain()
+            except ConnectionError:
+                pass
+            finally:
+                writer.close()
+
+    async def start(self,
+                    host: str = '127.0.0.1',
+                    port: int = 0,
+                    ) -> asyncio.AbstractServer:
+        """Запустить TCP-сервер."""
+        return await asyncio.start_server(self.handle, host, port,
+                                          limit=self.max_line)
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """Запустить сервер на Unix-сокете."""
+        return await asyncio.start_unix_server(self.handle, path,
+                                               limit=self.max_line)
+
+
+async def serve(host: str, port: int, unix: Optional[str] = None,
+                max_connections: int = DEFAULT_MAX_CONNECTIONS) -> None:
+    """Запустить сервер и обслуживать клиентов до остановки."""
+    package_server = PackageServer(max_connections)
+    if unix:
+        server = await package_server.start_unix(unix)
+    else:
+        server = await package_server.start(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Разобрать аргументы командной строки и запустить сервер."""
+    parser = argparse.ArgumentParser(description='Сервер пакетов трекеров')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help='путь к Unix-сокету')
+    parser.add_argument('--max-connections', type=int,
+                        default=DEFAULT_MAX_CONNECTIONS)
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.host, args.port, args.unix, args.max_connections))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,296 @@
+"""Распределённая обработка файлов пакетов: координатор и исполнители.
+
+Входные файлы делятся на шарды - диапазоны байтов не длиннее
+shard_bytes. Шарду принадлежат строки, которые начинаются внутри его
+диапазона, поэтому большой файл обрабатывают несколько исполнителей.
+Координатор по TCP отправляет исполнителю описание шарда строкой JSON,
+исполнитель обрабатывает строки через read_package и
+show_training_info, записывает сообщения во временный файл и
+возвращает частичную статистику по типам тренировок. Координатор
+повторяет упавшие шарды на других исполнителях, склеивает выходные
+файлы в порядке шардов и объединяет статистику.
+
+Исполнитель читает и пишет файлы только внутри своего корневого
+каталога root: запросы к нему не аутентифицируются.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+from threading import Lock
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from aggregation import WorkoutStats
+from package_io import READERS, process_packages, write_messages
+from validation import DeadLetterSink, validate_packages
+
+Address = Tuple[str, int]
+Shard = Tuple[str, int, Optional[int]]
+
+DEFAULT_SHARD_BYTES: int = 64 * 1024 * 1024
+
+
+def resolve_path(path: str, root: str) -> str:
+    """Получить полный путь внутри root или вызвать PermissionError."""
+    root = os.path.realpath(root)
+    full = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, full]) != root:
+        raise PermissionError(f'путь {path} вне каталога {root}')
+    return full
+
+
+def read_range(path: str, start: int = 0,
+               end: Optional[int] = None) -> Iterator[str]:
+    """Читать строки файла, начинающиеся в диапазоне байтов [start, end)."""
+    with open(path, 'rb') as stream:
+        if start:
+            stream.seek(start - 1)
+            stream.readline()
+            start = stream.tell()
+        position = start
+        for line in stream:
+            if end is not None and position >= end:
+                break
+            position += len(line)
+            yield line.decode('utf-8')
+
+
+def split_file(path: str, shard_bytes: int) -> List[Shard]:
+    """Разбить файл на диапазоны байтов; последний открыт справа."""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = 0
+    shards: List[Shard] = []
+    for start in range(0, max(size, 1), shard_bytes):
+        end = start + shard_bytes
+        shards.append((path, start, end if end < size else None))
+    return shards
+
+
+def process_shard(request: Dict[str, Any], root: str) -> Dict[str, Any]:
+    """Обработать один шард и вернуть частичные агрегаты."""
+    path = resolve_path(request['path'], root)
+    output = resolve_path(request['output'], root)
+    sink = DeadLetterSink(max_kept=0)
+    stats: Dict[str, WorkoutStats] = {}
+
+    def messages() -> Iterator[Any]:
+        lines = read_range(path, request.get('start', 0),
+                           request.get('end'))
+        packages = READERS[request['format']](lines, sink.reject_line)
+        for message in process_packages(validate_packages(packages, sink)):
+            group = stats.get(message.training_type)
+            if group is None:
+                group = stats[message.training_type] = WorkoutStats()
+            group.update(message)
+            yield message
+
+    with open(output, 'w', encoding='utf-8') as out:
+        count = write_messages(messages(), out)
+    return {
+        'ok': True,
+        'shard': request['shard'],
+        'count': count,
+        'rejected': dict(sink.counters),
+        'stats': {name: group.to_dict() for name, group in stats.items()},
+    }
+
+
+class ShardHandler(socketserver.StreamRequestHandler):
+    """Обработчик запросов исполнителя: одна строка JSON на шард."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                reply = process_shard(json.loads(line), self.server.root)
+            except Exception as error:
+                reply = {'ok': False, 'error': f'{type(error).__name__}: '
+                                               f'{error}'}
+            self.wfile.write(json.dumps(reply).encode() + b'\n')
+            self.wfile.flush()
+
+
+def serve_worker(host: str = '127.0.0.1', port: int = 0,
+                 ready: Optional[Any] = None, root: str = '.') -> None:
+    """Запустить исполнителя и обслуживать запросы до остановки.
+
+    Если передан конец канала ready, в него отправляется адрес сервера.
+    """
+    with socketserver.TCPServer((host, port), ShardHandler) as server:
+        server.root = os.path.realpath(root)  # type: ignore[attr-defined]
+        if ready is not None:
+            ready.send(server.server_address)
+        server.serve_forever()
+
+
+def start_local_workers(count: int, root: str = '.'
+                        ) -> List[Tuple[multiprocessing.Process, Address]]:
+    """Запустить count исполнителей в локальных процессах."""
+    workers = []
+    for _ in range(count):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=serve_worker,
+                                          kwargs={'ready': sender,
+                                                  'root': root},
+                                          daemon=True)
+        process.start()
+        workers.append((process, tuple(receiver.recv())))
+    return workers
+
+
+class ShardResult(NamedTuple):
+    """Итог обработки шарда координатором."""
+
+    shard: int
+    path: str
+    attempts: int
+    reply: Dict[str, Any]
+
+
+def send_shard(address: Address, request: Dict[str, Any],
+               timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Отправить шард исполнителю и дождаться ответа."""
+    with socket.create_connection(address, timeout=timeout) as connection:
+        connection.sendall(json.dumps(request).encode() + b'\n')
+        with connection.makefile('rb') as stream:
+            line = stream.readline()
+    if not line:
+        raise ConnectionError('исполнитель закрыл соединение')
+    return json.loads(line)
+
+
+class Coordinator:
+    """Раздаёт шарды исполнителям и собирает результаты."""
+
+    def __init__(self,
+                 workers: List[Address],
+                 retries: int = 2,
+                 timeout: Optional[float] = None) -> None:
+        if not workers:
+            raise ValueError('нужен хотя бы один исполнитель')
+        self.workers = workers
+        self.retries = retries
+        self.timeout = timeout
+        self._next_worker = cycle(workers)
+        self._lock = Lock()
+
+    def pick_worker(self) -> Address:
+        """Выбрать следующего исполнителя по кругу."""
+        with self._lock:
+            return next(self._next_worker)
+
+    def run_shard(self, shard: int, path: str, fmt: str, output: str,
+                  start: int = 0, end: Optional[int] = None) -> ShardResult:
+        """Обработать шард, повторяя попытки на других исполнителях."""
+        request = {'shard': shard, 'path': os.path.abspath(path),
+                   'start': start, 'end': end,
+                   'format': fmt, 'output': os.path.abspath(output)}
+        reply: Dict[str, Any] = {}
+        attempts = 0
+        while attempts <= self.retries:
+            attempts += 1
+            try:
+                reply = send_shard(self.pick_worker(), request, self.timeout)
+            except (OSError, ValueError) as error:
+                reply = {'ok': False, 'error': f'{type(error).__name__}: '
+                                               f'{error}'}
+            if reply['ok']:
+                break
+        return ShardResult(shard, path, attempts, reply)
+
+    def run(self, paths: List[str], output: str, fmt: str = 'csv',
+            shard_bytes: int = DEFAULT_SHARD_BYTES) -> Dict[str, Any]:
+        """Обработать файлы paths и записать все сообщения в output."""
+        shards = [shard for path in paths
+                  for shard in split_file(path, shard_bytes)]
+        parts = [f'{output}.part{shard}' for shard in range(len(shards))]
+        with ThreadPoolExecutor(max_workers=len(self.workers)) as executor:
+            results = list(executor.map(
+                lambda args: self.run_shard(*args),
+                [(shard, path, fmt, part, start, end)
+                 for shard, ((path, start, end), part)
+                 in enumerate(zip(shards, parts))]
+            ))
+        stats: Dict[str, WorkoutStats] = {}
+        rejected: Dict[str, int] = {}
+        failed = []
+        with open(output, 'w', encoding='utf-8') as out:
+            for result, part in zip(results, parts):
+                if not result.reply['ok']:
+                    failed.append({'path': result.path,
+                                   'shard': result.shard,
+                                   'error': result.reply['error']})
+                else:
+                    with open(part, encoding='utf-8') as stream:
+                        shutil.copyfileobj(stream, out)
+                    for name, data in result.reply['stats'].items():
+                        group = stats.setdefault(name, WorkoutStats())
+                        group.merge(WorkoutStats.from_dict(data))
+                    for reason, count in result.reply['rejected'].items():
+                        rejected[reason] = rejected.get(reason, 0) + count
+                if os.path.exists(part):
+                    os.remove(part)
+        return {
+            'count': sum(result.reply.get('count', 0) for result in results),
+            'shards': len(shards),
+            'rejected': rejected,
+            'failed': failed,
+            'stats': stats,
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Запустить исполнителя или координатора из командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    worker = commands.add_parser('worker', help='запустить исполнителя')
+    worker.add_argument('--host', default='127.0.0.1')
+    worker.add_argument('--port', type=int, default=0)
+    worker.add_argument('--root', default='.',
+                        help='каталог, вне которого файлы недоступны')
+    coordinator = commands.add_parser('run', help='обработать файлы')
+    coordinator.add_argument('inputs', nargs='+')
+    coordinator.add_argument('--output', '-o', required=True)
+    coordinator.add_argument('--format', default='csv')
+    coordinator.add_argument('--worker', action='append', default=[],
+                             help='адрес исполнителя host:port')
+    coordinator.add_argument('--local-workers', type=int, default=0,
+                             help='запустить исполнителей локально')
+    coordinator.add_argument('--retries', type=int, default=2)
+    coordinator.add_argument('--shard-bytes', type=int,
+                             default=DEFAULT_SHARD_BYTES,
+                             help='наибольший размер шарда в байтах')
+    args = parser.parse_args(argv)
+
+    if args.command == 'worker':
+        serve_worker(args.host, args.port, root=args.root)
+        return
+    if not args.worker and args.local_workers < 1:
+        parser.error('укажите --worker или --local-workers')
+    addresses = []
+    for address in args.worker:
+        host, port = address.rsplit(':', 1)
+        addresses.append((host, int(port)))
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path))
+                               for path in args.inputs + [args.output]])
+    local = start_local_workers(args.local_workers, root)
+    addresses.extend(address for _, address in local)
+    try:
+        summary = Coordinator(addresses, args.retries).run(
+            args.inputs, args.output, args.format, args.shard_bytes)
+    finally:
+        for process, _ in local:
+            process.terminate()
+    summary['stats'] = {name: group.to_dict()
+                        for name, group in summary['stats'].items()}
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+"""Встроенное хранилище результатов тренировок.
+
+Хранилище - каталог с сегментами `segment-NNNNNN.seg`, в которые только
+дописываются записи фиксированной длины RECORD: время (float64), номер
+пользователя (uint32), номер типа тренировки (uint8) и поля InfoMessage
+(float64). Имена пользователей и типов лежат в `users.txt` и `types.txt`
+по одному в строке, номер - это номер строки.
+
+Сжатие записывает сегмент `merged-NNNNNN.seg`, который заменяет все
+сегменты с меньшими номерами. Появление этого файла - момент фиксации
+сжатия: если процесс упал до удаления старых сегментов, они
+пропускаются и удаляются при следующем открытии.
+
+При открытии по сегментам строятся индексы: интервал времени сегмента
+и списки номеров записей для каждого пользователя и типа тренировки.
+Запросы читают сегменты через mmap и могут выполняться из других
+потоков одновременно с дозаписью.
+"""
+import mmap
+import os
+import struct
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from homework import InfoMessage
+
+RECORD = struct.Struct('<dIB3xdddd')
+SEGMENT_PREFIX = 'segment-'
+MERGED_PREFIX = 'merged-'
+SEGMENT_SUFFIX = '.seg'
+USERS = 'users.txt'
+TYPES = 'types.txt'
+DEFAULT_SEGMENT_RECORDS: int = 1 << 20
+COLUMNS = ('timestamp', 'duration', 'distance', 'speed', 'calories')
+
+
+class Segment:
+    """Один файл сегмента и его индексы."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.count = 0
+        self.min_time = float('inf')
+        self.max_time = float('-inf')
+        self.by_user: Dict[int, array] = {}
+        self.by_type: Dict[int, array] = {}
+
+    def index(self, timestamp: float, user: int, kind: int) -> None:
+        """Добавить в индексы запись с номером count."""
+        number = self.count
+        self.by_user.setdefault(user, array('I')).append(number)
+        self.by_type.setdefault(kind, array('I')).append(number)
+        self.min_time = min(self.min_time, timestamp)
+        self.max_time = max(self.max_time, timestamp)
+        self.count += 1
+
+    def overlaps(self, since: float, until: float) -> bool:
+        """Есть ли в сегменте записи из интервала [since, until)."""
+        return self.max_time >= since and self.min_time < until
+
+    def numbers(self,
+                count: int,
+                user: Optional[int] = None,
+                kind: Optional[int] = None) -> Iterator[int]:
+        """Номера первых count записей с учётом индексов."""
+        if user is not None:
+            numbers: Iterable[int] = self.by_user.get(user, ())
+        elif kind is not None:
+            numbers = self.by_type.get(kind, ())
+        else:
+            numbers = range(count)
+        for number in numbers:
+            if number >= count:
+                break
+            yield number
+
+    def load(self) -> None:
+        """Построить индексы по содержимому файла."""
+        with open(self.path, 'rb') as stream:
+            data = stream.read()
+        usable = len(data) - len(data) % RECORD.size
+        for timestamp, user, kind, *_ in RECORD.iter_unpack(data[:usable]):
+            self.index(timestamp, user, kind)
+
+
+def parse_segment_name(name: str) -> Optional[Tuple[int, bool]]:
+    """Получить номер сегмента и признак сжатого сегмента по имени файла."""
+    if not name.endswith(SEGMENT_SUFFIX):
+        return None
+    for prefix, merged in ((SEGMENT_PREFIX, False), (MERGED_PREFIX, True)):
+        if name.startswith(prefix):
+            digits = name[len(prefix):-len(SEGMENT_SUFFIX)]
+            if digits.isdigit():
+                return int(digits), merged
+    return None
+
+
+class Dictionary:
+    """Дописываемый словарь строк с номерами."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.names: List[str] = []
+        self.codes: Dict[str, int] = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as stream:
+                for line in stream:
+                    self._add(line.rstrip('\n'))
+
+    def _add(self, name: str) -> int:
+        code = self.codes[name] = len(self.names)
+        self.names.append(name)
+        return code
+
+    def code(self, name: str) -> int:
+        """Получить номер строки, добавив её в файл при необходимости."""
+        code = self.codes.get(name)
+        if code is None:
+            if '\n' in name:
+                raise ValueError('имя не должно содержать перевод строки')
+            with open(self.path, 'a', encoding='utf-8') as stream:
+                stream.write(name + '\n')
+            code = self._add(name)
+        return code
+
+
+class WorkoutStore:
+    """Хранилище результатов с индексами по пользователю, типу и времени."""
+
+    def __init__(self,
+                 path: str,
+                 segment_records: int = DEFAULT_SEGMENT_RECORDS) -> None:
+        self.path = path
+        self.segment_records = segment_records
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+        self.users = Dictionary(os.path.join(path, USERS))
+        self.types = Dictionary(os.path.join(path, TYPES))
+        self.segments: List[Segment] = []
+        found = []
+        for name in os.listdir(path):
+            parsed = parse_segment_name(name)
+            if parsed is not None:
+                found.append((*parsed, name))
+        found.sort()
+        base = max((number for number, merged, _ in found if merged),
+                   default=0)
+        for number, _, name in found:
+            segment_path = os.path.join(path, name)
+            if number < base:
+                # Остаток прерванного сжатия: записи уже в сегменте base.
+                os.remove(segment_path)
+                continue
+            segment = Segment(segment_path)
+            segment.load()
+            self.segments.append(segment)
+        self._active = None
+        self._next_number = found[-1][0] + 1 if found else 1
+
+    def __enter__(self) -> 'WorkoutStore':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(segment.count for segment in self.segments)
+
+    def _new_segment(self) -> Segment:
+        name = f'{SEGMENT_PREFIX}{self._next_number:06d}{SEGMENT_SUFFIX}'
+        self._next_number += 1
+        segment = Segment(os.path.join(self.path, name))
+        open(segment.path, 'ab').close()
+        self.segments.append(segment)
+        return segment
+
+    def append(self, user: str, info: InfoMessage, timestamp: float) -> None:
+        """Сохранить результат тренировки пользователя."""
+        self.append_many([(user, info, timestamp)])
+
+    def append_many(self,
+                    records: Iterable[Tuple[str, InfoMessage, float]]
+                    ) -> int:
+        """Сохранить несколько результатов одной записью в файл."""
+        count = 0
+        with self._lock:
+            chunk = []
+            for user, info, timestamp in records:
+                if (not self.segments or self._active is None
+                        or self.segments[-1].count + len(chunk)
+                        >= self.segment_records):
+                    self._flush(chunk)
+                    chunk = []
+                    self._close_active()
+                    segment = self._new_segment()
+                    self._active = open(segment.path, 'ab')
+                chunk.append((timestamp, self.users.code(user),
+                              self.types.code(info.training_type), info))
+                count += 1
+            self._flush(chunk)
+        return count
+
+    def _flush(self, chunk: List[Tuple[float, int, int, InfoMessage]]
+               ) -> None:
+        if not chunk:
+            return
+        self._active.write(b''.join(
+            RECORD.pack(timestamp, user, kind, info.duration, info.distance,
+                        info.speed, info.calories)
+            for timestamp, user, kind, info in chunk
+        ))
+        self._active.flush()
+        segment = self.segments[-1]
+        for timestamp, user, kind, _ in chunk:
+            segment.index(timestamp, user, kind)
+
+    def _close_active(self) -> None:
+        if self._active is not None:
+            self._active.close()
+            self._active = None
+
+    def close(self) -> None:
+        """Закрыть файл активного сегмента."""
+        with self._lock:
+            self._close_active()
+
+    def _open(self,
+              since: float,
+              until: float) -> List[Tuple[Segment, int, mmap.mmap]]:
+        """Отобразить в память сегменты, пересекающие [since, until).
+
+        Файлы открываются под блокировкой, чтобы сжатие не удалило их
+        до чтения; дальше запрос видит только первые count записей.
+        """
+        opened = []
+        for segment in self.segments:
+            count = segment.count
+            if not count or not segment.overlaps(since, until):
+                continue
+            with open(segment.path, 'rb') as stream:
+                opened.append((segment, count, mmap.mmap(
+                    stream.fileno(), count * RECORD.size,
+                    access=mmap.ACCESS_READ)))
+        return opened
+
+    def _records(self,
+                 user: Optional[str],
+                 training_type: Optional[str],
+                 since: Optional[float],
+                 until: Optional[float],
+                 ) -> Iterator[Tuple[float, int, float, float, float, float]]:
+        """Найти записи, подходящие под фильтры, в порядке добавления."""
+        since = float('-inf') if since is None else since
+        until = float('inf') if until is None else until
+        with self._lock:
+            user_code = self.users.codes.get(user) if user else None
+            type_code = (self.types.codes.get(training_type)
+                         if training_type else None)
+            if (user and user_code is None
+                    or training_type and type_code is None):
+                return
+            opened = self._open(since, until)
+        try:
+            for segment, count, data in opened:
+                for number in segment.numbers(count, user_code, type_code):
+                    record = RECORD.unpack_from(data, number * RECORD.size)
+                    if (type_code is not None and record[2] != type_code
+                            or not since <= record[0] < until):
+                        continue
+                    yield (record[0], *record[2:])
+        finally:
+            for _, _, data in opened:
+                data.close()
+
+    def query(self,
+              user: Optional[str] = None,
+              training_type: Optional[str] = None,
+              since: Optional[float] = None,
+              until: Optional[float] = None,
+              ) -> List[InfoMessage]:
+        """Получить сообщения о тренировках за интервал [since, until)."""
+        names = self.types.names
+        return [InfoMessage(names[kind], *values)
+                for _, kind, *values in self._records(user, training_type,
+                                                      since, until)]
+
+    def query_columns(self,
+                      user: Optional[str] = None,
+                      training_type: Optional[str] = None,
+                      since: Optional[float] = None,
+                      until: Optional[float] = None,
+                      ) -> Dict[str, array]:
+        """Получить время и поля InfoMessage подходящих записей колонками."""
+        columns = {name: array('d') for name in COLUMNS}
+        appenders = [columns[name].append for name in COLUMNS]
+        for timestamp, _, *values in self._records(user, training_type,
+                                                   since, until):
+            for append, value in zip(appenders, (timestamp, *values)):
+                append(value)
+        return columns
+
+    def compact(self, before: Optional[float] = None) -> int:
+        """Объединить все сегменты в один.
+
+        Записи старше before удаляются. Возвращает число оставшихся
+        записей. Сжатый сегмент получает номер больше всех старых,
+        поэтому после его переименования старые сегменты не читаются,
+        даже если удалить их не удалось.
+        """
+        with self._lock:
+            self._close_active()
+            old = list(self.segments)
+            merged = Segment(os.path.join(
+                self.path,
+                f'{MERGED_PREFIX}{self._next_number:06d}{SEGMENT_SUFFIX}'))
+            self._next_number += 1
+            tmp_path = merged.path + '.tmp'
+            with open(tmp_path, 'wb') as out:
+                for segment in old:
+                    with open(segment.path, 'rb') as stream:
+                        data = stream.read(segment.count * RECORD.size)
+                    for record in RECORD.iter_unpack(data):
+                        if before is not None and record[0] < before:
+                            continue
+                        out.write(RECORD.pack(*record))
+                        merged.index(record[0], record[1], record[2])
+            os.replace(tmp_path, merged.path)
+            self.segments = [merged]
+            for segment in old:
+                os.remove(segment.path)
+            return merged.count
@@ -0,0 +1,52 @@
+import pytest
+
+from aggregation import DAY, WEEK, WorkoutAggregator
+from homework import read_package
+
+MONDAY = 4 * DAY
+
+
+def info(workout_type, data):
+    return read_package(workout_type, data).show_training_info()
+
+
+@pytest.fixture
+def aggregator():
+    aggregator = WorkoutAggregator()
+    aggregator.update('alice', info('RUN', [15000, 1, 75]), MONDAY)
+    aggregator.update('alice', info('RUN', [9000, 1, 75]), MONDAY + 60)
+    aggregator.update('alice', info('SWM', [720, 1, 80, 25, 40]),
+                      MONDAY + DAY)
+    aggregator.update('bob', info('WLK', [9000, 1, 75, 180]), MONDAY)
+    return aggregator
+
+
+def test_stats_per_user_and_type(aggregator):
+    stats = aggregator.stats(user='alice', training_type='Running')
+    assert stats.count == 2
+    distance = stats.get('distance')
+    assert distance['total'] == pytest.approx(9.75 + 5.85)
+    assert distance['mean'] == pytest.approx((9.75 + 5.85) / 2)
+    assert (distance['min'], distance['max']) == (5.85, 9.75)
+
+
+def test_stats_per_window(aggregator):
+    assert aggregator.stats(user='alice', since=MONDAY,
+                            until=MONDAY + DAY).count == 2
+    assert aggregator.stats(since=MONDAY + DAY).count == 1
+    assert aggregator.stats().count == 4
+
+
+def test_window_start():
+    assert WorkoutAggregator(WEEK).window_start(WEEK + 5 * DAY) == WEEK
+
+
+def test_snapshot_restore(aggregator, tmp_path):
+    path = str(tmp_path / 'state.json')
+    aggregator.save(path)
+    restored = WorkoutAggregator.load(path)
+    assert restored.snapshot() == aggregator.snapshot(), (
+        'Агрегатор должен восстанавливаться из снимка без потерь.'
+    )
+    restored.update('bob', info('WLK', [9000, 1, 75, 180]), MONDAY)
+    assert restored.stats(user='bob').count == 2
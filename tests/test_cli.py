@@ -0,0 +1,117 @@
+import json
+from io import BytesIO
+
+import pytest
+
+import cli
+import columnar
+import packed
+from homework import read_package
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+EXPECTED = [read_package(*package).show_training_info().get_message()
+            for package in PACKAGES]
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / 'day1.csv'
+    path.write_text('SWM,720,1,80,25,40\nRUN,15000,1,75\nXXX,1,2,3\n'
+                    'WLK,9000,1,75,180\n', encoding='utf-8')
+    return path
+
+
+def test_demo(capsys):
+    assert cli.main([]) == 0
+    assert capsys.readouterr().out.splitlines() == EXPECTED, (
+        'Без аргументов должны обрабатываться демонстрационные пакеты.'
+    )
+
+
+@pytest.mark.parametrize('options', [
+    [],
+    ['--batch'],
+    ['--batch', '--chunk-size', '2'],
+    ['--workers', '2', '--chunk-size', '1'],
+])
+def test_process_text(csv_file, capsys, options):
+    assert cli.main(['process', str(csv_file)] + options) == 0
+    captured = capsys.readouterr()
+    assert captured.out.splitlines() == EXPECTED
+    assert 'Обработано пакетов: 3, отклонено: 1' in captured.err
+
+
+def test_process_glob_and_jsonl(csv_file, tmp_path, capsys):
+    (tmp_path / 'day2.csv').write_text('RUN,15000,1,75\n', encoding='utf-8')
+    output = tmp_path / 'out.jsonl'
+    rejects = tmp_path / 'rejects.jsonl'
+    exit_code = cli.main([
+        'process', str(tmp_path / 'day*.csv'), '--output', str(output),
+        '--output-format', 'jsonl', '--rejects', str(rejects), '--strict',
+        '--quiet',
+    ])
+    assert exit_code == 1
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record['training_type'] for record in records] == [
+        'Swimming', 'Running', 'SportsWalking', 'Running'
+    ]
+    assert json.loads(rejects.read_text())['reason'] == 'unknown_type'
+    assert capsys.readouterr().err == ''
+
+
+def test_process_binary(tmp_path, capsys):
+    buffer = BytesIO()
+    packed.write_packages(PACKAGES, buffer)
+    path = tmp_path / 'packages.bin'
+    path.write_bytes(buffer.getvalue())
+    assert cli.main(['process', str(path), '-q']) == 0
+    assert capsys.readouterr().out.splitlines() == EXPECTED
+
+
+@pytest.mark.parametrize('content', [b'', b'garbage!'])
+def test_process_invalid_binary(tmp_path, capsys, content):
+    path = tmp_path / 'packages.bin'
+    path.write_bytes(content)
+    assert cli.main(['process', str(path), '-q']) == 1
+    assert capsys.readouterr().err == (
+        f'Ошибка: {path}: неизвестный формат файла пакетов\n'
+    ), 'Повреждённый двоичный файл должен сообщать об ошибке без traceback.'
+
+
+def test_process_columnar(csv_file, tmp_path):
+    output = str(tmp_path / 'columns')
+    assert cli.main(['process', str(csv_file), '--output', output,
+                     '--output-format', 'columnar', '-q']) == 0
+    with columnar.ColumnarReader(output) as reader:
+        assert [message.get_message()
+                for message in reader.iter_messages()] == EXPECTED
+
+
+def test_columnar_requires_output(csv_file):
+    with pytest.raises(SystemExit):
+        cli.main(['process', str(csv_file), '--output-format', 'columnar'])
+
+
+def test_process_parse_errors(csv_file, tmp_path, capsys):
+    (tmp_path / 'bad.csv').write_text('RUN,abc,1,75\n', encoding='utf-8')
+    (tmp_path / 'bad.jsonl').write_text('not json\n["RUN", [15000, 1, 75]]\n',
+                                        encoding='utf-8')
+    rejects = tmp_path / 'rejects.jsonl'
+    assert cli.main(['process', str(csv_file), str(tmp_path / 'bad.csv'),
+                     str(tmp_path / 'bad.jsonl'), '--rejects',
+                     str(rejects), '--strict']) == 1
+    captured = capsys.readouterr()
+    assert captured.out.splitlines() == EXPECTED + [EXPECTED[1]], (
+        'Строки, которые не удалось разобрать, не должны прерывать запуск.'
+    )
+    assert 'parse_error: 2' in captured.err
+    records = [json.loads(line) for line in
+               rejects.read_text(encoding='utf-8').splitlines()]
+    assert [record['data'] for record in records
+            if record['reason'] == 'parse_error'] == [
+        'RUN,abc,1,75', 'not json'
+    ]
@@ -0,0 +1,53 @@
+import columnar
+from homework import read_package
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1.5, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+MESSAGES = [read_package(*package).show_training_info()
+            for package in PACKAGES]
+
+
+def test_roundtrip(tmp_path):
+    path = str(tmp_path / 'results')
+    assert columnar.write_columns(MESSAGES, path) == len(MESSAGES)
+    with columnar.ColumnarReader(path) as reader:
+        assert len(reader) == len(MESSAGES)
+        assert list(reader.iter_messages()) == MESSAGES, (
+            'Сообщения должны восстанавливаться из колонок без потери '
+            'точности.'
+        )
+
+
+def test_single_column(tmp_path):
+    path = str(tmp_path / 'results')
+    columnar.write_columns(MESSAGES, path)
+    with columnar.ColumnarReader(path) as reader:
+        calories = reader.column('calories')
+        assert calories.tolist() == [
+            message.calories for message in MESSAGES
+        ]
+        assert reader.types == ['Swimming', 'Running', 'SportsWalking']
+
+
+def test_append_and_small_buffer(tmp_path):
+    path = str(tmp_path / 'results')
+    with columnar.ColumnarWriter(path, buffer_rows=1) as writer:
+        writer.write_many(MESSAGES[:2])
+    with columnar.ColumnarWriter(path) as writer:
+        writer.write_many(MESSAGES[2:])
+    with columnar.ColumnarReader(path) as reader:
+        assert list(reader.iter_messages()) == MESSAGES, (
+            'Запись в существующий набор данных должна дописывать строки.'
+        )
+
+
+def test_empty_dataset(tmp_path):
+    path = str(tmp_path / 'results')
+    columnar.write_columns([], path)
+    with columnar.ColumnarReader(path) as reader:
+        assert len(reader) == 0
+        assert list(reader.iter_messages()) == []
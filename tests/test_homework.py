@@ -1,7 +1,12 @@
+import os
+import random
 import re
+import subprocess
+import sys
 import pytest
 import types
 import inspect
+from concurrent.futures import ThreadPoolExecutor
 from conftest import Capturing
 
 try:
@@ -363,3 +368,332 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+@pytest.mark.parametrize('workout_type, rows', [
+    ('SWM', [[720, 1, 80, 25, 40], [420, 4, 20, 42, 4], [1206, 12, 6, 12, 6]]),
+    ('RUN', [[9000, 1, 75], [420, 4, 20], [1206, 12, 6]]),
+    ('WLK', [[9000, 1, 75, 180], [420, 4, 20, 42], [1206, 12, 6, 12]]),
+])
+def test_compute_batch(workout_type, rows):
+    distances, speeds, calories = homework.compute_batch(workout_type, rows)
+    for row, distance, speed, spent in zip(rows, distances, speeds, calories):
+        training = homework.read_package(workout_type, row)
+        assert (distance, speed, spent) == (
+            training.get_distance(),
+            training.get_mean_speed(),
+            training.get_spent_calories(),
+        ), (
+            'Функция `compute_batch` должна возвращать те же значения, '
+            'что и методы классов тренировок.'
+        )
+
+
+def test_compute_batch_empty():
+    assert homework.compute_batch('RUN', []) == ([], [], []), (
+        'Для пустой пачки `compute_batch` должна вернуть пустые списки.'
+    )
+
+
+def test_compute_batch_unknown_type():
+    with pytest.raises(ValueError):
+        homework.compute_batch('XXX', [[1, 1, 1]])
+
+
+@pytest.mark.parametrize('packages', [
+    [('RUN', [15000, 1, 75, 999])],
+    [('WLK', [9000, 1, 75, 180]), ('WLK', [9000, 1, 75])],
+])
+def test_compute_batch_wrong_arity(packages):
+    for package in packages:
+        if len(package[1]) != homework.WORKOUT_TYPES[package[0]].arity:
+            with pytest.raises(TypeError):
+                homework.process(*package)
+    with pytest.raises(TypeError):
+        homework.process_many(packages)
+    with pytest.raises(TypeError):
+        homework.compute_batch(packages[0][0],
+                               [data for _, data in packages])
+
+
+@pytest.mark.parametrize('training_class, rows', [
+    (homework.Swimming, [[720, 1, 80, 25, 40], [420, 4, 20, 42, 4]]),
+    (homework.Running, [[9000, 1, 75], [1206, 12, 6]]),
+    (homework.SportsWalking, [[9000, 1, 75, 180], [420, 4, 20, 42]]),
+])
+def test_TrainingBatch(training_class, rows):
+    batch = homework.TrainingBatch(training_class, rows)
+    assert len(batch) == len(rows)
+    for view, row in zip(batch, rows):
+        training = training_class(*row)
+        assert isinstance(view, training_class)
+        assert view.duration == row[1]
+        assert view.get_spent_calories() == training.get_spent_calories(), (
+            'Представление из `TrainingBatch` должно считать калории '
+            'так же, как класс тренировки.'
+        )
+        assert (view.show_training_info().get_message()
+                == training.show_training_info().get_message())
+    assert batch.compute() == training_class.compute_batch(rows)
+    assert type(batch[0]) is homework.view_class(training_class), (
+        'Класс представления должен строиться один раз для класса '
+        'тренировки.'
+    )
+
+
+def test_TrainingBatch_wrong_length():
+    batch = homework.TrainingBatch(homework.Running)
+    with pytest.raises(TypeError):
+        batch.append([9000, 1])
+    with pytest.raises(IndexError):
+        batch[0]
+
+
+def test_InfoMessage_slots():
+    info_message = homework.InfoMessage('Running', 1, 2, 3, 4)
+    assert not hasattr(info_message, '__dict__'), (
+        'У `InfoMessage` должны быть заданы `__slots__`.'
+    )
+
+
+def test_render_many():
+    messages = [
+        homework.InfoMessage('Swimming', 1, 75, 1, 80),
+        homework.InfoMessage('Running', 12, 0.7839, 0.065325, -81.3203),
+    ]
+    expected = ''.join(message.get_message() + '\n' for message in messages)
+    assert homework.render_many(messages) == expected, (
+        'Функция `render_many` должна выводить сообщения '
+        'в том же формате, что и `get_message`.'
+    )
+    with Capturing() as output:
+        assert homework.render_many(messages, sys.stdout) is None
+    assert output == expected.splitlines()
+
+
+def test_Training_metrics_recomputed():
+    swimming = homework.Swimming(720, 1, 80, 25, 40)
+    assert swimming.metrics == (swimming.get_distance(), 1.0, 336.0), (
+        'Свойство `metrics` должно возвращать дистанцию, '
+        'скорость и калории.'
+    )
+    swimming.count_pool = 80
+    assert swimming.metrics.speed == 2.0, (
+        'Показатели должны пересчитываться при изменении параметров.'
+    )
+    swimming.duration = 2
+    assert swimming.metrics == homework.Swimming(720, 2, 80, 25, 80).metrics
+
+
+class FastRunning(homework.Running):
+    def get_mean_speed(self):
+        return 100.0
+
+
+class FixedCaloriesRunning(homework.Running):
+    def get_spent_calories(self):
+        return 42.0
+
+
+@pytest.mark.parametrize('training_class', [FastRunning,
+                                            FixedCaloriesRunning])
+def test_Training_public_overrides(training_class):
+    training = training_class(15000, 1, 75)
+    expected = (training.get_distance(), training.get_mean_speed(),
+                training.get_spent_calories())
+    assert tuple(training.metrics) == expected, (
+        'Свойство `metrics` должно учитывать переопределённые '
+        'публичные методы.'
+    )
+    info = training.show_training_info()
+    assert (info.distance, info.speed, info.calories) == expected, (
+        'Метод `show_training_info` должен учитывать переопределённые '
+        'публичные методы.'
+    )
+
+
+def test_Training_metrics_computed_once(monkeypatch):
+    running = homework.Running(9000, 1, 75)
+    calls = []
+    get_distance = homework.Running.get_distance
+
+    def counting_get_distance(self):
+        calls.append(self)
+        return get_distance(self)
+    monkeypatch.setattr(homework.Running, 'get_distance',
+                        counting_get_distance)
+    info = running.show_training_info()
+    assert len(calls) == 1, (
+        'Метод `show_training_info` должен рассчитывать дистанцию '
+        'один раз и передавать её в расчёт скорости и калорий.'
+    )
+    assert info == homework.InfoMessage('Running', 1,
+                                        running.get_distance(),
+                                        running.get_mean_speed(),
+                                        running.get_spent_calories())
+
+
+def test_workout_registry():
+    assert homework.CODE_WORKOUT == {
+        'RUN': homework.Running,
+        'WLK': homework.SportsWalking,
+        'SWM': homework.Swimming,
+    }, 'Классы тренировок должны быть зарегистрированы под своими кодами.'
+    assert homework.WORKOUT_TYPES['SWM'].fields == (
+        'action', 'duration', 'weight', 'length_pool', 'count_pool'
+    )
+    assert homework.WORKOUT_TYPES['WLK'].arity == 4
+
+
+def test_register_workout(monkeypatch):
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES',
+                        dict(homework.WORKOUT_TYPES))
+    monkeypatch.setattr(homework, 'CODE_WORKOUT',
+                        dict(homework.CODE_WORKOUT))
+
+    @homework.register_workout('CYC')
+    class Cycling(homework.Running):
+        LEN_STEP = 5.0
+
+    assert homework.read_package('CYC', [100, 1, 70]).get_distance() == 0.5
+    with pytest.raises(ValueError):
+        homework.register_workout('RUN')(Cycling)
+
+
+@pytest.fixture
+def custom_workouts(monkeypatch):
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES',
+                        dict(homework.WORKOUT_TYPES))
+    monkeypatch.setattr(homework, 'CODE_WORKOUT',
+                        dict(homework.CODE_WORKOUT))
+
+    @homework.register_workout('XYZ')
+    class Custom(homework.Training):
+        def get_spent_calories(self):
+            return 1.0
+
+    @homework.register_workout('RNX')
+    class FixedRunning(homework.Running):
+        def get_spent_calories(self):
+            return 42.0
+
+    return [('XYZ', [1, 1, 1]), ('RNX', [15000, 1, 75]),
+            ('XYZ', [9000, 2, 80]), ('RUN', [15000, 1, 75])]
+
+
+def test_compute_batch_registered(custom_workouts):
+    expected = [homework.process(*package) for package in custom_workouts]
+    assert homework.process_many(custom_workouts) == expected, (
+        'Пачка с типами из реестра должна считаться так же, '
+        'как отдельные пакеты.'
+    )
+    distances, speeds, calories = homework.compute_batch(
+        'RNX', [[15000, 1, 75]]
+    )
+    assert calories == [42.0], (
+        'Подкласс без собственных формул для пачек не должен '
+        'наследовать формулы родителя.'
+    )
+
+
+def test_read_packages():
+    packages = [('RUN', [15000, 1, 75]), ('XXX', [1]),
+                ('SWM', [720, 1, 80, 25, 40])]
+    with Capturing() as output:
+        trainings = list(homework.read_packages(packages))
+    assert [type(training).__name__ for training in trainings] == [
+        'Running', 'Swimming'
+    ], 'Функция `read_packages` должна пропускать неизвестные коды.'
+    assert output == ['XXX - недопустимый код тренировки!']
+
+
+def test_compute_messages():
+    packages = [('SWM', [720, 1, 80, 25, 40]), ('RUN', [15000, 1, 75]),
+                ('WLK', [9000, 1, 75, 180]), ('RUN', [1206, 12, 6])]
+    messages = homework.compute_messages(packages)
+    assert messages == [
+        homework.read_package(*package).show_training_info()
+        for package in packages
+    ], (
+        'Функция `compute_messages` должна возвращать сообщения '
+        'в порядке исходных пакетов.'
+    )
+
+
+def test_import_is_lightweight():
+    code = ('import sys, homework; '
+            "print(sorted({'typing', 'dataclasses', 'inspect', 're'} "
+            '& set(sys.modules)))')
+    result = subprocess.run([sys.executable, '-c', code], check=True,
+                            capture_output=True, text=True,
+                            cwd=os.path.dirname(homework.__file__))
+    assert result.stdout.strip() == '[]', (
+        'Импорт `homework` не должен загружать тяжёлые модули.'
+    )
+
+
+def test_run_as_module_imports_once():
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-m',
+                             'homework'], check=True, capture_output=True,
+                            text=True, cwd=os.path.dirname(homework.__file__))
+    imported = [line.rsplit('|', 1)[1].strip()
+                for line in result.stderr.splitlines() if '|' in line]
+    assert 'cli' in imported
+    assert 'homework' not in imported, (
+        'При запуске `python -m homework` модуль не должен '
+        'импортироваться повторно.'
+    )
+    assert result.stdout.count('Тип тренировки') == 3
+
+
+def test_InfoMessage_equality_and_repr():
+    info_message = homework.InfoMessage('Running', 1, 2.0, 3.0, 4.0)
+    assert info_message == homework.InfoMessage('Running', 1, 2.0, 3.0, 4.0)
+    assert info_message != homework.InfoMessage('Running', 1, 2.0, 3.0, 5.0)
+    assert repr(info_message) == (
+        "InfoMessage(training_type='Running', duration=1, distance=2.0, "
+        'speed=3.0, calories=4.0)'
+    )
+
+
+def test_process():
+    assert homework.process('RUN', [15000, 1, 75]) == (
+        homework.read_package('RUN', [15000, 1, 75]).show_training_info()
+    )
+    with pytest.raises(ValueError):
+        homework.process('XXX', [1, 1, 1])
+
+
+def test_process_thread_safety(custom_workouts):
+    rng = random.Random(1)
+    packages = []
+    for _ in range(2000):
+        workout_type = rng.choice(['RUN', 'WLK', 'SWM', 'XYZ', 'RNX'])
+        data = [rng.randint(100, 30000), rng.randint(0, 3),
+                rng.randint(45, 120)]
+        if workout_type == 'WLK':
+            data.append(rng.randint(150, 200))
+        elif workout_type == 'SWM':
+            data += [rng.choice((25, 50)), rng.randint(10, 80)]
+        packages.append((workout_type, data))
+    expected = [homework.read_package(*package).show_training_info()
+                for package in packages]
+    chunks = [packages[start:start + 50]
+              for start in range(0, len(packages), 50)]
+    with Capturing() as output:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            single = list(executor.map(lambda package:
+                                       homework.process(*package),
+                                       packages))
+            batched = [message for messages in
+                       executor.map(homework.process_many, chunks)
+                       for message in messages]
+    assert single == expected, (
+        'Функция `process` в потоках должна совпадать с расчётом '
+        'по одному пакету.'
+    )
+    assert batched == expected, (
+        'Функция `process_many` в потоках должна совпадать с расчётом '
+        'по одному пакету.'
+    )
+    assert output == [], 'Функции `process` не должны ничего выводить.'
@@ -0,0 +1,103 @@
+import pytest
+
+import homework
+import instrumentation
+import package_io
+from conftest import Capturing
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [9000, 1, 75]),
+]
+
+
+def run_pipeline():
+    for package in PACKAGES:
+        homework.read_package(*package).show_training_info().get_message()
+
+
+def test_instrument_counts_stages():
+    original = homework.Running._spent_calories
+    with instrumentation.instrument() as metrics:
+        run_pipeline()
+    assert homework.Running._spent_calories is original, (
+        'После выхода из контекста методы должны быть восстановлены.'
+    )
+    counts = {key: histogram.count
+              for key, histogram in metrics.histograms.items()}
+    assert counts == {
+        ('read_package', 'Swimming'): 1,
+        ('read_package', 'Running'): 2,
+        ('show_training_info', 'Swimming'): 1,
+        ('show_training_info', 'Running'): 2,
+        ('get_spent_calories', 'Swimming'): 1,
+        ('get_spent_calories', 'Running'): 2,
+        ('get_message', 'Swimming'): 1,
+        ('get_message', 'Running'): 2,
+    }
+
+
+def test_instrument_process_packages():
+    packages = PACKAGES + [('XXX', [1, 1, 1])]
+    original = package_io.read_packages
+    with instrumentation.instrument() as metrics:
+        messages = list(package_io.process_packages(packages))
+    assert package_io.read_packages is original
+    assert len(messages) == 3
+    counts = {key: histogram.count
+              for key, histogram in metrics.histograms.items()
+              if key[0] == 'read_package'}
+    assert counts == {
+        ('read_package', 'Swimming'): 1,
+        ('read_package', 'Running'): 2,
+        ('read_package', 'unknown'): 1,
+    }, 'Этап read_package должен учитывать пакеты из read_packages.'
+
+
+def test_instrument_counts_errors():
+    with instrumentation.instrument() as metrics:
+        with pytest.raises(TypeError):
+            homework.read_package('RUN', [1])
+    assert metrics.errors == {('read_package', 'Running'): 1}
+
+
+def test_export(tmp_path):
+    with instrumentation.instrument() as metrics:
+        run_pipeline()
+    text = metrics.to_prometheus()
+    assert ('workout_stage_seconds_count'
+            '{stage="read_package",workout_type="Running"} 2') in text
+    assert ('workout_stage_seconds_bucket'
+            '{stage="read_package",workout_type="Running",le="+Inf"} 2'
+            ) in text
+    data = metrics.to_dict()
+    assert sum(stage['count'] for stage in data['stages']) == 12
+    path = tmp_path / 'metrics.json'
+    metrics.write(str(path), 'json')
+    assert path.read_text(encoding='utf-8').startswith('{')
+
+
+def test_export_untrusted_labels():
+    with instrumentation.instrument() as metrics:
+        with Capturing():
+            for workout_type in ('X"Y', 'A\\B', 'C\nD'):
+                homework.read_package(workout_type, [1, 1, 1])
+    assert [key for key in metrics.histograms] == [
+        ('read_package', 'unknown')
+    ], 'Неизвестные коды должны учитываться под одной меткой.'
+    metrics.observe('get_message', 'X"Y\\\n', 0.0)
+    text = metrics.to_prometheus()
+    assert ('workout_stage_seconds_count'
+            '{stage="get_message",workout_type="X\\"Y\\\\\\n"} 1'
+            ) in text, 'Значения меток должны экранироваться.'
+
+
+def test_sampling_profiler(tmp_path):
+    path = tmp_path / 'profile.txt'
+    with instrumentation.sampling_profiler(str(path), interval=0.001):
+        for _ in range(2000):
+            run_pipeline()
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert lines, 'Профилировщик должен записать хотя бы один стек.'
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
@@ -0,0 +1,90 @@
+from io import StringIO
+
+import pytest
+
+import package_io
+from homework import read_package
+
+CSV_INPUT = (
+    'SWM,720,1,80,25,40\n'
+    '\n'
+    'RUN,15000,1,75\n'
+    'WLK,9000,1.5,75,180\n'
+)
+
+JSONL_INPUT = (
+    '["SWM", [720, 1, 80, 25, 40]]\n'
+    '{"workout_type": "RUN", "data": [15000, 1, 75]}\n'
+    '\n'
+    '["WLK", [9000, 1.5, 75, 180]]\n'
+)
+
+EXPECTED_PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1.5, 75, 180]),
+]
+
+
+def test_read_csv_packages():
+    result = list(package_io.iter_packages(StringIO(CSV_INPUT), 'csv'))
+    assert result == EXPECTED_PACKAGES, (
+        'Пакеты из CSV должны читаться в виде (код тренировки, данные).'
+    )
+    assert isinstance(result[0][1][0], int), (
+        'Целые значения из CSV должны оставаться целыми числами.'
+    )
+
+
+def test_read_jsonl_packages():
+    result = list(package_io.iter_packages(StringIO(JSONL_INPUT), 'jsonl'))
+    assert result == EXPECTED_PACKAGES, (
+        'Пакеты из JSON Lines должны читаться в виде '
+        '(код тренировки, данные).'
+    )
+
+
+def test_iter_packages_from_file(tmp_path):
+    path = tmp_path / 'packages.csv'
+    path.write_text(CSV_INPUT, encoding='utf-8')
+    assert list(package_io.iter_packages(str(path))) == EXPECTED_PACKAGES
+
+
+def test_iter_packages_is_lazy():
+    def lines():
+        yield 'RUN,15000,1,75\n'
+        raise AssertionError('Пакеты должны читаться лениво.')
+
+    packages = package_io.iter_packages(lines())
+    assert next(packages) == ('RUN', [15000, 1, 75])
+
+
+def test_write_messages():
+    messages = package_io.process_packages(EXPECTED_PACKAGES)
+    out = StringIO()
+    count = package_io.write_messages(messages, out, buffer_size=1)
+    expected = [
+        read_package(*package).show_training_info().get_message()
+        for package in EXPECTED_PACKAGES
+    ]
+    assert count == len(expected)
+    assert out.getvalue().splitlines() == expected, (
+        'Функция `write_messages` должна записывать по одному '
+        'сообщению в строке.'
+    )
+
+
+@pytest.mark.parametrize('fmt, text, bad', [
+    ('csv', 'RUN,abc,1,75\nRUN,15000,1,75\n', ['RUN,abc,1,75']),
+    ('jsonl', 'not json\n{"data": [1]}\n["RUN", [15000, 1, 75]]\n',
+     ['not json', '{"data": [1]}']),
+])
+def test_iter_packages_parse_errors(fmt, text, bad):
+    with pytest.raises(ValueError):
+        list(package_io.iter_packages(StringIO(text), fmt))
+    rejected = []
+    packages = package_io.iter_packages(StringIO(text), fmt, rejected.append)
+    assert list(packages) == [('RUN', [15000, 1, 75])], (
+        'Строки, которые не удалось разобрать, должны пропускаться.'
+    )
+    assert rejected == bad
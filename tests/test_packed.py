@@ -0,0 +1,121 @@
+from io import BytesIO
+
+import pytest
+
+import homework
+import packed
+from homework import read_package
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1.5, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('RUN', [15000.0, 0.1, 75]),
+    ('RUN', [100000, 1, 75]),
+    ('SWM', [1922, 0.32, 110, 50, 61]),
+    ('RUN', [5579, 1e-7, 75.25]),
+]
+
+
+def pack(packages):
+    out = BytesIO()
+    assert packed.write_packages(packages, out) == len(packages)
+    return out.getvalue()
+
+
+def test_smaller_than_csv():
+    data = pack(PACKAGES * 100)
+    csv_size = sum(len(','.join([code, *map(str, values)])) + 1
+                   for code, values in PACKAGES * 100)
+    assert len(data) < csv_size * 0.6, (
+        'Двоичный формат должен занимать меньше места, чем CSV.'
+    )
+    assert len(packed.encode_package('RUN', [15000, 1, 75])) == (
+        packed.HEADER.size + 3 + 7
+    ), 'Значения до 65535 должны храниться в uint16.'
+    assert len(packed.encode_package('SWM', [1922, 0.32, 110, 50, 61])) == (
+        packed.HEADER.size + 5 + 11
+    ), 'Дроби с двумя знаками должны храниться в сотых долях.'
+
+
+def test_roundtrip():
+    data = memoryview(pack(PACKAGES))
+    result = list(packed.iter_packages(data))
+    assert result == PACKAGES, (
+        'Пакеты должны читаться из двоичного формата без изменений.'
+    )
+    assert [type(value) for value in result[4][1]] == [float] * 2 + [int]
+    for training, package in zip(packed.iter_trainings(data), PACKAGES):
+        expected = read_package(*package).show_training_info()
+        assert training.show_training_info() == expected
+
+
+def test_load_batches():
+    batches = packed.load_batches(pack(PACKAGES))
+    assert {code: len(batch) for code, batch in batches.items()} == {
+        'SWM': 2, 'RUN': 5, 'WLK': 1,
+    }
+    assert batches['RUN'][1].get_spent_calories() == (
+        read_package('RUN', [1206, 12, 6]).get_spent_calories()
+    )
+
+
+def test_type_registered_after_import(monkeypatch):
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES',
+                        dict(homework.WORKOUT_TYPES))
+    monkeypatch.setattr(homework, 'CODE_WORKOUT',
+                        dict(homework.CODE_WORKOUT))
+
+    @homework.register_workout('CYC')
+    class Cycling(homework.Running):
+        LEN_STEP = 5.0
+
+    data = pack([('CYC', [100, 1, 70])])
+    assert [type(training) for training in packed.iter_trainings(data)] == [
+        Cycling
+    ], 'Классы должны искаться в реестре во время чтения.'
+
+
+def test_map_file(tmp_path):
+    path = tmp_path / 'packages.bin'
+    path.write_bytes(pack(PACKAGES))
+    with packed.map_file(str(path)) as data:
+        assert list(packed.iter_packages(data)) == PACKAGES
+    with packed.map_file(str(path)) as data:
+        records = packed.iter_packages(data)
+        assert next(records) == PACKAGES[0], (
+            'Файл должен закрываться, даже если записи не дочитаны.'
+        )
+
+
+def test_map_empty_file(tmp_path):
+    path = tmp_path / 'empty.bin'
+    path.write_bytes(b'')
+    with pytest.raises(ValueError, match='неизвестный формат'):
+        with packed.map_file(str(path)):
+            pass
+
+
+@pytest.mark.parametrize('data', [
+    b'garbage!' + bytes(16),
+    packed.MAGIC + b'\x00RUN',
+    packed.MAGIC + b'\x01\x00\x00',
+    packed.MAGIC + packed.encode_package('RUN', [1, 1, 1])[:-1],
+    packed.MAGIC + b'\x00RUN\x01s\x01a',
+])
+def test_invalid_file(data):
+    with pytest.raises(ValueError):
+        list(packed.iter_packages(data))
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [1, 2, 3, 4, 5, 6]),
+    ('RUNX', [15000, 1, 75]),
+    ('RU', [15000, 1, 75]),
+    ('БЕГ', [15000, 1, 75]),
+    ('RUN', [2**64, 1, 75]),
+])
+def test_encode_package_invalid(workout_type, data):
+    with pytest.raises(ValueError):
+        packed.encode_package(workout_type, data)
@@ -0,0 +1,47 @@
+import pytest
+
+import parallel
+from package_io import chunked, process_packages
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('SWM', [420, 4, 20, 42, 4]),
+] * 7
+
+
+def test_chunked():
+    chunks = list(chunked(range(7), 3))
+    assert chunks == [[0, 1, 2], [3, 4, 5], [6]], (
+        'Функция `chunked` должна делить поток на блоки заданного размера.'
+    )
+
+
+def test_process_parallel_ordered():
+    result = list(parallel.process_parallel(PACKAGES, workers=2,
+                                            chunk_size=4))
+    assert result == list(process_packages(PACKAGES)), (
+        'Параллельная обработка должна сохранять порядок пакетов.'
+    )
+
+
+def test_process_parallel_batch():
+    result = list(parallel.process_parallel(PACKAGES, workers=2,
+                                            chunk_size=4, batch=True))
+    assert [message.get_message() for message in result] == [
+        message.get_message() for message in process_packages(PACKAGES)
+    ], 'Пакетный режим должен давать те же сообщения в том же порядке.'
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 100])
+def test_process_parallel_unordered(chunk_size):
+    result = parallel.process_parallel(PACKAGES, workers=2,
+                                       chunk_size=chunk_size, ordered=False)
+    messages = [message.get_message() for message in result]
+    expected = [message.get_message()
+                for message in process_packages(PACKAGES)]
+    assert sorted(messages) == sorted(expected), (
+        'Параллельная обработка должна вернуть сообщения по всем пакетам.'
+    )
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+import precision
+from homework import compute_batch
+
+
+def random_rows(workout_type, count=500, seed=1):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        row = [rng.randint(100, 30000), rng.uniform(0.25, 3),
+               rng.randint(45, 120)]
+        if workout_type == 'WLK':
+            row.append(rng.randint(150, 200))
+        elif workout_type == 'SWM':
+            row += [rng.choice((25, 50)), rng.randint(10, 80)]
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize('workout_type', ['RUN', 'WLK', 'SWM'])
+def test_float32_error(workout_type):
+    rows = random_rows(workout_type)
+    reference = dict(zip(precision.FIELDS, compute_batch(workout_type, rows)))
+    results = precision.CompactResults('float32')
+    results.extend(workout_type, rows)
+    for field in precision.FIELDS:
+        for value, expected in zip(results.values(field), reference[field]):
+            assert abs(value - expected) <= (
+                precision.float32_error_bound(expected)
+            ), 'Ошибка float32 должна укладываться в заявленную границу.'
+
+
+@pytest.mark.parametrize('workout_type', ['RUN', 'WLK', 'SWM'])
+@pytest.mark.parametrize('scale', [100, 1000])
+def test_fixed_error(workout_type, scale):
+    rows = random_rows(workout_type)
+    reference = dict(zip(precision.FIELDS, compute_batch(workout_type, rows)))
+    results = precision.CompactResults('fixed', scale=scale)
+    results.extend(workout_type, rows)
+    bound = precision.fixed_error_bound(scale)
+    for field in precision.FIELDS:
+        errors = [abs(value - expected) for value, expected
+                  in zip(results.values(field), reference[field])]
+        assert max(errors) <= bound + 1e-12, (
+            'Ошибка fixed-point должна быть не больше 0.5 / scale.'
+        )
+        assert abs(results.total(field) - sum(reference[field])) <= (
+            bound * len(rows)
+        )
+
+
+def test_memory_footprint():
+    rows = random_rows('RUN')
+    results = precision.CompactResults('fixed', typecode='h', scale=10)
+    results.extend('RUN', rows)
+    assert results.nbytes() == len(rows) * 3 * 2, (
+        'Режим с int16 должен занимать вчетверо меньше памяти, чем float64.'
+    )
+
+
+def test_overflow():
+    results = precision.CompactResults('fixed', typecode='h')
+    results.extend('RUN', [[5000, 1, 10]])
+    with pytest.raises(OverflowError):
+        results.extend('RUN', [[1000, 1, 75], [30000, 1, 120]])
+    assert [len(results.columns[field]) for field in precision.FIELDS] == [
+        1, 1, 1
+    ], 'После ошибки длины колонок не должны меняться.'
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        precision.CompactResults('float16')
@@ -0,0 +1,69 @@
+from homework import read_package
+from result_cache import ResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hits_and_misses():
+    cache = ResultCache()
+    first = cache.process('RUN', [15000, 1, 75])
+    second = cache.process('RUN', [15000, 1.0, 75])
+    assert first is second, (
+        'Повторный пакет должен возвращаться из кэша.'
+    )
+    assert first == read_package('RUN', [15000, 1, 75]).show_training_info()
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_lru_eviction():
+    cache = ResultCache(max_size=2)
+    cache.process('RUN', [15000, 1, 75])
+    cache.process('RUN', [9000, 1, 75])
+    cache.process('RUN', [15000, 1, 75])
+    cache.process('SWM', [720, 1, 80, 25, 40])
+    assert cache.get('RUN', [9000, 1, 75]) is None, (
+        'Из кэша должна вытесняться самая давно использованная запись.'
+    )
+    assert cache.get('RUN', [15000, 1, 75]) is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_ttl():
+    clock = FakeClock()
+    cache = ResultCache(ttl=10, clock=clock)
+    cache.process('RUN', [15000, 1, 75])
+    clock.now += 11
+    assert cache.get('RUN', [15000, 1, 75]) is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_unknown_package_is_not_cached(capsys):
+    cache = ResultCache()
+    assert cache.process('XXX', [1]) is None
+    assert len(cache) == 0
+
+
+def test_save_and_load(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / 'cache.jsonl')
+    cache = ResultCache(ttl=10, clock=clock)
+    cache.process('RUN', [15000, 1, 75])
+    clock.now += 5
+    cache.process('SWM', [720, 1, 80, 25, 40])
+    cache.save(path)
+
+    clock.now += 6
+    restored = ResultCache(clock=clock)
+    assert restored.load(path) == 1, (
+        'Просроченные записи не должны загружаться с диска.'
+    )
+    assert restored.get('SWM', [720, 1, 80, 25, 40]) == (
+        read_package('SWM', [720, 1, 80, 25, 40]).show_training_info()
+    )
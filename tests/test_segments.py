@@ -0,0 +1,40 @@
+import pytest
+
+import segments
+from homework import read_package
+
+
+def test_running_samples():
+    live = segments.start_training('RUN', 1000, 75)
+    assert live.show_training_info().speed == 0.0, (
+        'До первых замеров скорость должна быть нулевой.'
+    )
+    live.add_samples((1000 + 600 * minute, 1500) for minute in range(1, 7))
+    expected = read_package('RUN', [9000, 1, 75]).show_training_info()
+    assert live.show_training_info() == expected, (
+        'Итог по замерам должен совпадать с расчётом по итоговым данным.'
+    )
+    assert live.samples == 6
+
+
+def test_walking_out_of_order_sample():
+    live = segments.start_training('WLK', 0, 75, 180)
+    live.add_sample(3600, 6000)
+    live.add_sample(1800, 3000)
+    assert live.show_training_info() == (
+        read_package('WLK', [9000, 1, 75, 180]).show_training_info()
+    ), 'Запоздавший замер не должен уменьшать длительность.'
+
+
+def test_swimming_laps():
+    live = segments.start_training('SWM', 0, 80, 25)
+    for minute in range(1, 61):
+        live.add_sample(minute * 60, 12, laps_delta=1 if minute % 3 else 0)
+    info = live.show_training_info()
+    expected = read_package('SWM', [720, 1, 80, 25, 40]).show_training_info()
+    assert info == expected
+
+
+def test_unknown_workout_type():
+    with pytest.raises(KeyError):
+        segments.start_training('XXX', 0, 75)
@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+import server
+
+
+async def exchange(package_server, frames):
+    tcp_server = await package_server.start()
+    port = tcp_server.sockets[0].getsockname()[1]
+    async with tcp_server:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for frame in frames:
+            writer.write(frame)
+        await writer.drain()
+        replies = [json.loads(await reader.readline()) for _ in frames]
+        writer.close()
+        await writer.wait_closed()
+    return replies
+
+
+def test_server_replies():
+    frames = [
+        b'["SWM", [720, 1, 80, 25, 40]]\n',
+        b'{"workout_type": "RUN", "data": [15000, 1, 75]}\n',
+        b'["XXX", [1, 2, 3]]\n',
+        b'["WLK", [9000, 1]]\n',
+        b'not json\n',
+        b'["RUN", [1' + b'0' * 400 + b', 1, 75]]\n',
+        b'["RUN", [1e308, 1e-308, 75]]\n',
+    ]
+    package_server = server.PackageServer(max_connections=2)
+    replies = asyncio.run(exchange(package_server, frames))
+    assert replies[0] == {
+        'training_type': 'Swimming',
+        'duration': 1,
+        'distance': 0.9935999999999999,
+        'speed': 1.0,
+        'calories': 336.0,
+    }, 'Сервер должен отвечать полями InfoMessage.'
+    assert replies[1]['training_type'] == 'Running'
+    assert all('error' in reply for reply in replies[2:]), (
+        'На некорректные пакеты сервер должен отвечать ошибкой.'
+    )
+    assert replies[-2:] == [{'error': 'out_of_range'}] * 2, (
+        'Пакеты с недопустимыми значениями должны отклоняться '
+        'до расчёта.'
+    )
+    assert package_server.processed == len(frames)
+
+
+def test_server_line_limit():
+    package_server = server.PackageServer(max_line=16)
+    replies = asyncio.run(exchange(package_server, [b'x' * 64 + b'\n']))
+    assert replies == [{'error': 'line too long'}]
@@ -0,0 +1,134 @@
+import socket
+
+import pytest
+
+import sharding
+from homework import read_package
+
+SHARDS = [
+    'SWM,720,1,80,25,40\nRUN,15000,1,75\n',
+    'WLK,9000,1,75,180\nXXX,1,1,1\n',
+    'RUN,9000,1,75\n',
+]
+
+
+@pytest.fixture(scope='module')
+def root(tmp_path_factory):
+    return tmp_path_factory.mktemp('root')
+
+
+@pytest.fixture(scope='module')
+def workers(root):
+    local = sharding.start_local_workers(2, str(root))
+    yield [address for _, address in local]
+    for process, _ in local:
+        process.terminate()
+        process.join()
+
+
+@pytest.fixture
+def workdir(root, request):
+    path = root / request.node.name.replace('[', '_').rstrip(']')
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def inputs(workdir):
+    paths = []
+    for index, text in enumerate(SHARDS):
+        path = workdir / f'shard{index}.csv'
+        path.write_text(text, encoding='utf-8')
+        paths.append(str(path))
+    return paths
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()
+
+
+def expected_lines():
+    packages = [line.split(',') for text in SHARDS
+                for line in text.splitlines() if not line.startswith('XXX')]
+    return [read_package(code, [int(value) for value in data])
+            .show_training_info().get_message()
+            for code, *data in packages]
+
+
+def test_coordinator_merges_shards(workers, inputs, workdir):
+    output = workdir / 'result.txt'
+    summary = sharding.Coordinator(workers).run(inputs, str(output))
+    assert output.read_text(encoding='utf-8').splitlines() == (
+        expected_lines()
+    ), 'Координатор должен склеивать результаты в порядке шардов.'
+    assert summary['count'] == 4
+    assert summary['rejected'] == {'unknown_type': 1}
+    assert summary['failed'] == []
+    assert summary['stats']['Running'].count == 2
+    assert not list(workdir.glob('*.part*'))
+
+
+def test_coordinator_retries_failed_worker(workers, inputs, workdir):
+    output = workdir / 'result.txt'
+    coordinator = sharding.Coordinator([closed_port()] + workers, retries=2)
+    summary = coordinator.run(inputs, str(output))
+    assert summary['failed'] == [], (
+        'Шард должен повторяться на другом исполнителе.'
+    )
+    assert output.read_text(encoding='utf-8').splitlines() == (
+        expected_lines()
+    )
+
+
+def test_coordinator_reports_failed_shard(workers, inputs, workdir):
+    output = workdir / 'result.txt'
+    coordinator = sharding.Coordinator(workers, retries=1)
+    summary = coordinator.run(inputs + [str(workdir / 'missing.csv')],
+                              str(output))
+    assert [failure['path'] for failure in summary['failed']] == [
+        str(workdir / 'missing.csv')
+    ]
+    assert 'FileNotFoundError' in summary['failed'][0]['error']
+    assert summary['count'] == 4
+
+
+@pytest.mark.parametrize('shard_bytes', [1, 10, 17, 1000])
+def test_coordinator_splits_files(workers, inputs, workdir, shard_bytes):
+    output = workdir / 'result.txt'
+    summary = sharding.Coordinator(workers).run(inputs, str(output),
+                                                shard_bytes=shard_bytes)
+    assert output.read_text(encoding='utf-8').splitlines() == (
+        expected_lines()
+    ), 'Каждая строка должна попасть ровно в один шард.'
+    assert summary['count'] == 4
+    assert summary['shards'] >= len(inputs)
+    if shard_bytes == 10:
+        assert summary['shards'] > len(inputs), (
+            'Большие файлы должны делиться на несколько шардов.'
+        )
+
+
+def test_worker_rejects_paths_outside_root(workers, inputs, workdir,
+                                           tmp_path_factory):
+    outside = tmp_path_factory.mktemp('outside') / 'day.csv'
+    outside.write_text(SHARDS[0], encoding='utf-8')
+    output = workdir / 'result.txt'
+    summary = sharding.Coordinator(workers, retries=0).run(
+        [str(outside)], str(output))
+    assert 'PermissionError' in summary['failed'][0]['error'], (
+        'Исполнитель не должен читать файлы вне корневого каталога.'
+    )
+    with pytest.raises(PermissionError):
+        sharding.process_shard({'path': inputs[0], 'format': 'csv',
+                                'output': str(outside), 'shard': 0},
+                               str(workdir))
+
+
+def test_coordinator_requires_workers(capsys):
+    with pytest.raises(ValueError):
+        sharding.Coordinator([])
+    with pytest.raises(SystemExit):
+        sharding.main(['run', 'day.csv', '-o', 'out.txt'])
+    assert '--local-workers' in capsys.readouterr().err
@@ -0,0 +1,122 @@
+import threading
+
+import pytest
+
+import store
+from homework import InfoMessage, read_package
+
+PACKAGES = [
+    ('anna', 'SWM', [720, 1, 80, 25, 40], 100.0),
+    ('boris', 'RUN', [15000, 1, 75], 200.0),
+    ('anna', 'WLK', [9000, 1, 75, 180], 300.0),
+    ('anna', 'RUN', [9000, 1, 75], 400.0),
+]
+
+
+def info(code, data):
+    return read_package(code, data).show_training_info()
+
+
+def fill(workout_store):
+    workout_store.append_many(
+        (user, info(code, data), timestamp)
+        for user, code, data, timestamp in PACKAGES
+    )
+
+
+@pytest.fixture
+def workout_store(tmp_path):
+    with store.WorkoutStore(str(tmp_path / 'store'),
+                            segment_records=3) as workout_store:
+        fill(workout_store)
+        yield workout_store
+
+
+def test_query_filters(workout_store):
+    assert workout_store.query() == [
+        info(code, data) for _, code, data, _ in PACKAGES
+    ], 'Без фильтров запрос должен вернуть все записи по порядку.'
+    assert workout_store.query(user='anna') == [
+        info(code, data) for user, code, data, _ in PACKAGES
+        if user == 'anna'
+    ]
+    assert workout_store.query(training_type='Running', since=300) == [
+        info('RUN', [9000, 1, 75])
+    ]
+    assert [message.training_type for message in
+            workout_store.query(user='anna', since=100, until=400)] == [
+        'Swimming', 'SportsWalking'
+    ], 'Интервал времени должен быть полуоткрытым [since, until).'
+    assert workout_store.query(user='nobody') == []
+    assert len(workout_store.segments) == 2
+
+
+def test_query_columns(workout_store):
+    columns = workout_store.query_columns(user='anna')
+    assert list(columns) == list(store.COLUMNS)
+    assert list(columns['timestamp']) == [100.0, 300.0, 400.0]
+    assert list(columns['calories']) == [
+        info(code, data).calories for user, code, data, _ in PACKAGES
+        if user == 'anna'
+    ]
+
+
+def test_reopen_and_compact(workout_store, tmp_path):
+    workout_store.close()
+    reopened = store.WorkoutStore(workout_store.path, segment_records=3)
+    assert reopened.query() == workout_store.query(), (
+        'Индексы должны восстанавливаться по файлам сегментов.'
+    )
+    reopened.append('boris', InfoMessage('Running', 1, 2, 3, 4), 500.0)
+    assert len(reopened.segments) == 3
+    assert reopened.compact(before=200.0) == 4
+    assert len(reopened.segments) == 1
+    assert [message.training_type for message in reopened.query()] == [
+        'Running', 'SportsWalking', 'Running', 'Running'
+    ], 'Сжатие должно удалять записи старше before.'
+    assert len(list(tmp_path.glob('store/*.seg'))) == 1
+    reopened.close()
+
+
+def test_interrupted_compact(workout_store, monkeypatch):
+    expected = workout_store.query()
+
+    def crash(path):
+        raise OSError('сбой при удалении')
+    monkeypatch.setattr(store.os, 'remove', crash)
+    with pytest.raises(OSError):
+        workout_store.compact()
+    monkeypatch.undo()
+    workout_store.close()
+    with store.WorkoutStore(workout_store.path) as reopened:
+        assert reopened.query() == expected, (
+            'После прерванного сжатия записи не должны дублироваться.'
+        )
+        assert len(reopened.segments) == 1
+        reopened.append('boris', InfoMessage('Running', 1, 2, 3, 4), 500.0)
+    with store.WorkoutStore(workout_store.path) as reopened:
+        assert len(reopened) == len(expected) + 1
+
+
+def test_query_during_ingestion(tmp_path):
+    workout_store = store.WorkoutStore(str(tmp_path), segment_records=50)
+    message = info('RUN', [15000, 1, 75])
+    errors = []
+
+    def ingest():
+        for timestamp in range(500):
+            workout_store.append('anna', message, float(timestamp))
+
+    writer = threading.Thread(target=ingest)
+    writer.start()
+    while writer.is_alive():
+        try:
+            found = workout_store.query_columns(user='anna')['timestamp']
+            assert list(found) == [float(value)
+                                   for value in range(len(found))]
+        except AssertionError as error:
+            errors.append(error)
+    writer.join()
+    workout_store.close()
+    assert not errors, 'Запросы во время записи должны видеть префикс данных.'
+    assert len(workout_store.query(user='anna')) == 500
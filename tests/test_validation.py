@@ -0,0 +1,91 @@
+from io import StringIO
+import json
+
+import pytest
+
+import validation
+from homework import InfoMessage, Running, Swimming, read_package
+
+VALID_PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', (15000, 1.5, 75)),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+@pytest.mark.parametrize('workout_type, data, reason', [
+    ('XXX', [1, 1, 1], validation.UNKNOWN_TYPE),
+    (['RUN'], [1, 1, 1], validation.UNKNOWN_TYPE),
+    ('RUN', [15000, 1], validation.WRONG_ARITY),
+    ('RUN', None, validation.WRONG_ARITY),
+    ('RUN', [15000, '1', 75], validation.NOT_A_NUMBER),
+    ('RUN', [15000, float('nan'), 75], validation.NOT_A_NUMBER),
+    ('RUN', [True, 1, 75], validation.NOT_A_NUMBER),
+    ('RUN', [-1, 1, 75], validation.OUT_OF_RANGE),
+    ('RUN', [10**400, 1, 75], validation.OUT_OF_RANGE),
+    ('RUN', [15000, -10**400, 75], validation.OUT_OF_RANGE),
+    ('WLK', [9000, 1, 75, 0], validation.OUT_OF_RANGE),
+    ('SWM', [720, 0, 80, 25, 40], validation.ZERO_DURATION),
+    ('RUN', [1e300, 1e-300, 75], validation.OUT_OF_RANGE),
+    ('RUN', [15000, 1000, 75], validation.OUT_OF_RANGE),
+    ('SWM', [1, 1, 1, 1e200, 1e200], validation.OUT_OF_RANGE),
+    ('WLK', [9000, 1, 75, 1800], validation.OUT_OF_RANGE),
+])
+def test_check_package(workout_type, data, reason):
+    assert validation.check_package(workout_type, data) == reason, (
+        'Функция `check_package` должна возвращать код причины отказа.'
+    )
+
+
+@pytest.mark.parametrize('workout_type, data', VALID_PACKAGES)
+def test_check_valid_package(workout_type, data):
+    assert validation.check_package(workout_type, data) is None
+
+
+def test_check_result():
+    assert validation.check_result(
+        read_package('RUN', [15000, 1, 75]).show_training_info()
+    ) is None
+    assert validation.check_result(
+        InfoMessage('Running', 1, 1.0, float('inf'), float('nan'))
+    ) == validation.OUT_OF_RANGE, (
+        'Функция `check_result` должна отклонять неконечные показатели.'
+    )
+
+
+def test_validate_packages():
+    out = StringIO()
+    sink = validation.DeadLetterSink(out, max_kept=1)
+    packages = VALID_PACKAGES + [
+        ('XXX', [1]),
+        ('RUN', [0, 0, 75]),
+        'garbage',
+    ]
+    assert list(validation.validate_packages(packages, sink)) == (
+        VALID_PACKAGES
+    ), 'Корректные пакеты должны проходить проверку без изменений.'
+    assert sink.counters == {
+        validation.UNKNOWN_TYPE: 1,
+        validation.ZERO_DURATION: 1,
+        validation.WRONG_ARITY: 1,
+    }
+    assert len(sink) == 3
+    assert list(sink.rejected) == [
+        validation.Rejection(validation.WRONG_ARITY, None, 'garbage')
+    ]
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records[0] == {
+        'reason': 'unknown_type', 'workout_type': 'XXX', 'data': [1]
+    }
+
+
+@pytest.mark.parametrize('training_class, row', [
+    (Running, [15000, 0, 75]),
+    (Swimming, [720, 0, 80, 25, 40]),
+])
+def test_zero_duration_mean_speed(training_class, row):
+    assert training_class(*row).get_mean_speed() == 0.0, (
+        'При нулевой длительности средняя скорость должна быть равна 0.'
+    )
+    distances, speeds, calories = training_class.compute_batch([row])
+    assert speeds == [0.0]
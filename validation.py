@@ -0,0 +1,112 @@
+"""Проверка пакетов перед обработкой.
+
+Некорректные пакеты не вызывают исключений: они отправляются
+в DeadLetterSink вместе с кодом причины.
+"""
+import json
+import math
+from collections import Counter, deque
+from typing import (IO, Any, Deque, Iterable, Iterator, NamedTuple,
+                    Optional)
+
+from homework import WORKOUT_TYPES, InfoMessage
+from package_io import Package
+
+UNKNOWN_TYPE = 'unknown_type'
+WRONG_ARITY = 'wrong_arity'
+NOT_A_NUMBER = 'not_a_number'
+OUT_OF_RANGE = 'out_of_range'
+ZERO_DURATION = 'zero_duration'
+PARSE_ERROR = 'parse_error'
+
+
+class Rejection(NamedTuple):
+    """Отклонённый пакет и причина отказа."""
+
+    reason: str
+    workout_type: Any
+    data: Any
+
+
+class DeadLetterSink:
+    """Приёмник отклонённых пакетов со счётчиками причин.
+
+    Если передан поток out, каждый пакет записывается в него строкой
+    JSON. Последние max_kept пакетов хранятся в списке rejected.
+    """
+
+    def __init__(self,
+                 out: Optional[IO[str]] = None,
+                 max_kept: int = 1000,
+                 ) -> None:
+        self.out = out
+        self.counters: Counter = Counter()
+        self.rejected: Deque[Rejection] = deque(maxlen=max_kept)
+
+    def __len__(self) -> int:
+        return sum(self.counters.values())
+
+    def reject(self, reason: str, workout_type: Any, data: Any) -> None:
+        """Принять отклонённый пакет."""
+        self.counters[reason] += 1
+        rejection = Rejection(reason, workout_type, data)
+        self.rejected.append(rejection)
+        if self.out is not None:
+            self.out.write(json.dumps(rejection._asdict(), default=repr,
+                                      ensure_ascii=False) + '\n')
+
+    def reject_line(self, line: str) -> None:
+        """Принять строку входных данных, которую не удалось разобрать."""
+        self.reject(PARSE_ERROR, None, line)
+
+
+def check_package(workout_type: Any, data: Any) -> Optional[str]:
+    """Вернуть код причины отказа или None для корректного пакета."""
+    if type(workout_type) is not str:
+        return UNKNOWN_TYPE
+    workout = WORKOUT_TYPES.get(workout_type)
+    if workout is None:
+        return UNKNOWN_TYPE
+    if not isinstance(data, (list, tuple)) or len(data) != workout.arity:
+        return WRONG_ARITY
+    for field, value, positive, (low, high) in zip(
+            workout.fields, data, workout.positive, workout.limits):
+        kind = type(value)
+        if kind is float:
+            if not math.isfinite(value):
+                return NOT_A_NUMBER
+        elif kind is not int:
+            return NOT_A_NUMBER
+        if positive and value == 0:
+            return ZERO_DURATION if field == 'duration' else OUT_OF_RANGE
+        if not low <= value <= high:
+            return OUT_OF_RANGE
+    return None
+
+
+def check_result(info: InfoMessage) -> Optional[str]:
+    """Вернуть код причины отказа, если показатели не конечны.
+
+    Для встроенных типов это исключают пределы полей, но у классов
+    из реестра без FIELD_LIMITS значения ограничены только знаком.
+    """
+    if not (math.isfinite(info.distance) and math.isfinite(info.speed)
+            and math.isfinite(info.calories)):
+        return OUT_OF_RANGE
+    return None
+
+
+def validate_packages(packages: Iterable[Package],
+                      sink: DeadLetterSink) -> Iterator[Package]:
+    """Пропустить корректные пакеты и отправить остальные в sink."""
+    for package in packages:
+        try:
+            workout_type, data = package
+        except (TypeError, ValueError):
+            sink.reject(WRONG_ARITY, None, package)
+            continue
+        reason = check_package(workout_type, data)
+        if reason is None:
+            yield workout_type, data
+        else:
+            sink.reject(reason, workout_type, data)